@@ -1,57 +1,41 @@
-import requests
-import time
-import streamlit as st
-import json
-import time
-import base64
-from datetime import datetime
-
-def track_recycling(grantAddresses,start_date,voter_addresses):
-
-    recycled_addresses = {}
-    count = 0
-    for address in grantAddresses:
-        count += 1
-        if count % 5 == 0:
-            time.sleep(1)
-        params = {
-            "module": "account",
-            "action": "txlist",
-            "address": address,
-            "startblock": 0,
-            "endblock": 99999999,
-            "sort": "asc",
-            "apikey": st.secrets["ARB_SCAN_KEY"],
-        }
-
-        response = requests.get("https://api.arbiscan.io/api", params=params).json()["result"]
-        inspect_point = int(datetime.strptime(start_date, "%Y-%m-%d").timestamp())
-        filtered_transactions = [transaction for transaction in response if int(transaction["timeStamp"]) >= inspect_point]
-
-        unique_addresses_in_transactions = set()
-        for transaction in filtered_transactions:
-            unique_addresses_in_transactions.add(transaction["to"])
-
-        recycled = list(set(voter_addresses) & unique_addresses_in_transactions)
-
-        recycled_addresses[address] = recycled
-    recycled_addresses = json.dumps(recycled_addresses,indent=2)
-    encoded_data = base64.b64encode(recycled_addresses.encode()).decode()
-    api_url = f'https://api.github.com/repos/G-r-ay/Arbitrum-QA-Dashboard/contents/review_db/{st.session_state.round_id}/recycle_clusters.json'
-    github_token = st.secrets["ACCESS_TOKEN"]
-    headers = {
-        "Authorization": f"Bearer {github_token}"
-    }
-
-    response = requests.get(api_url, headers=headers)
-    if response.status_code == 200:
-        file_info = response.json()
-        payload = {
-            "message": "Updated recycle_clusters.json",
-            "content": encoded_data,
-            "sha": file_info["sha"]
-        }
-
-        update_response = requests.put(api_url, json=payload, headers=headers)
-        if update_response.status_code == 200:
-            print("recycle_clusters.json updated successfully.")
+import streamlit as st
+import json
+from datetime import datetime
+from utils.arbiscan import get_client
+from Defense_systems.fund_flow import FundFlowTracer
+from utils.storage import storage
+
+
+def start_block(client, inspect_point):
+    """First block mined at or after the inspect point, resolved once per scan."""
+    return int(client.get({
+        "module": "block",
+        "action": "getblocknobytime",
+        "timestamp": inspect_point,
+        "closest": "after",
+    }))
+
+
+def publish(round_id, file_name, data):
+    storage.write(f"review_db/{round_id}/{file_name}", json.dumps(data, indent=2).encode())
+
+
+def track_recycling(grantAddresses,start_date,voter_addresses,round_id):
+
+    client = get_client(st.secrets["ARB_SCAN_KEY"])
+    inspect_point = int(datetime.strptime(start_date, "%Y-%m-%d").timestamp())
+    tracer = FundFlowTracer(client, start_block(client, inspect_point), inspect_point)
+    # Lower-cased lookup back to the voter address as it appears in the votes
+    voter_index = {str(voter).lower(): voter for voter in voter_addresses}
+
+    traced = tracer.trace(grantAddresses, voter_index.keys())
+    recycled_addresses = {}
+    recycle_paths = {}
+    for address in grantAddresses:
+        reached = traced[address.lower()]
+        recycled_addresses[address] = sorted(voter_index[flow["voter"]] for flow in reached)
+        recycle_paths[address] = [dict(flow, voter=voter_index[flow["voter"]]) for flow in reached]
+    print(f"traced {len(tracer.histories)} wallets within {tracer.max_hops} hops of {len(grantAddresses)} grants")
+
+    publish(round_id, "recycle_clusters.json", recycled_addresses)
+    publish(round_id, "recycle_paths.json", recycle_paths)
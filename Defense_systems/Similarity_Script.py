@@ -1,66 +1,34 @@
-import numpy as np
-import pandas as pd
-import json
-from sklearn.metrics.pairwise import cosine_similarity
-from sklearn.preprocessing import MinMaxScaler
-import json
-import streamlit as st
-import time
-import requests
-import base64
-scaler = MinMaxScaler()
-
-def cluster_addresses(feature_dataset, threshold=0.9995):
-    address = set()
-    data = scaler.fit_transform(np.array(feature_dataset[feature_dataset.columns[1:]]))
-
-    voter = feature_dataset["voter"].values.reshape(-1, 1)
-    data = np.hstack((voter, data))
-
-    similarity_matrix = cosine_similarity(data[:, 1:])
-
-    similar_rows = []
-
-    assigned_voters = set()
-
-    for i in range(len(similarity_matrix)):
-        if data[i, 0] in assigned_voters:
-            continue
-        similar_row_indices = np.where(similarity_matrix[i] >= threshold)[0]
-        if len(similar_row_indices) > 1:
-            similar_row_values = [
-                tuple(feature_dataset.iloc[j]) for j in similar_row_indices
-            ]
-            similar_rows.append(similar_row_values)
-            assigned_voters.update(data[similar_row_indices, 0])
-
-    similar_rows_json = {}
-
-    for i, row_group in enumerate(similar_rows):
-        cluster_group = []
-        for row in row_group:
-            cluster_group.append(row[0])
-            if row[0] not in address:
-                address.add(row[0])
-        similar_rows_json[f"Cluster Group {i}"] = cluster_group
-
-    similar_rows_json = json.dumps(similar_rows_json)
-    encoded_data = base64.b64encode(similar_rows_json.encode()).decode()
-    api_url = f'https://api.github.com/repos/G-r-ay/Arbitrum-QA-Dashboard/contents/review_db/{st.session_state.round_id}/cosine_clusters.json'
-    github_token = st.secrets["ACCESS_TOKEN"]
-    headers = {
-        "Authorization": f"Bearer {github_token}"
-    }
-
-    response = requests.get(api_url, headers=headers)
-    if response.status_code == 200:
-        file_info = response.json()
-        payload = {
-            "message": "Updated cosine_clusters.json",
-            "content": encoded_data,
-            "sha": file_info["sha"]
-        }
-
-        update_response = requests.put(api_url, json=payload, headers=headers)
-        if update_response.status_code == 200:
-            print("cosine_clusters.json updated successfully.")
+import numpy as np
+from utils.address import to_parquet
+from utils.storage import storage
+from Defense_systems.neighbor_index import build_neighbor_index, publish_neighbor_index
+TREE_FLOOR = 0.999  # lowest threshold the merge tree can be cut at
+
+def cluster_addresses_incremental(feature_dataset, round_id, index, threshold=0.9995):
+    """
+        Only new or changed voters are searched against the round's
+        ClusterIndex and groups are single-linkage components.
+        The merge tree down to TREE_FLOOR and the top-k neighbour index of
+        the round's current voters are published with the clusters for the
+        Defense page, each only when it changed.
+        feature_dataset has to be encoded with index.encodings.
+    """
+    searched = index.update(feature_dataset, min(TREE_FLOOR, threshold))
+    print(f"searched {searched} of {len(feature_dataset)} voters")
+    publish_clusters(index.clusters(threshold, feature_dataset["voter"]), round_id)
+    publish_merge_tree(index.merge_tree(), round_id)
+    present = np.isin(index.voters, list(feature_dataset["voter"]))
+    publish_neighbor_index(build_neighbor_index(index.top_neighbors, index.top_scores, index.voters, present), round_id)
+
+
+def publish_merge_tree(tree, round_id):
+    storage.write_if_changed(f"review_db/{round_id}/merge_tree.parquet", to_parquet(tree))
+
+
+def publish_clusters(groups, round_id):
+    similar_rows_json = {}
+
+    for i, cluster_group in enumerate(groups):
+        similar_rows_json[f"Cluster Group {i}"] = list(cluster_group)
+
+    storage.write_json(f"review_db/{round_id}/cosine_clusters.json", similar_rows_json)
@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+from scipy.sparse import csr_matrix
+from Defense_systems.similarity_engine import UnionFind
+from utils.storage import storage
+
+# ----------------------------------------------------------------------
+# Constants
+# ----------------------------------------------------------------------
+WINDOW_BLOCKS = 1200  # ~5 minutes of Arbitrum blocks
+MIN_BURST = 5  # distinct voters on one project inside a window
+MAX_BURST = 200  # larger bursts are crowd events (round launch, announcements), not rings
+MIN_SHARED_BURSTS = 2  # bursts on different projects two voters must share to be linked
+
+
+def burst_episodes(voting_data, window=WINDOW_BLOCKS, min_burst=MIN_BURST):
+    """
+        First vote of every (voter, project) pair with the burst episode it
+        falls in, or -1. Votes are sorted by (project, block) once, and each
+        vote's window is found with one searchsorted over the whole array; the
+        windows holding min_burst votes are merged into episodes per project.
+    """
+    votes = voting_data[["voter", "projectId", "blockNumber"]].sort_values("blockNumber")
+    votes = votes.drop_duplicates(subset=["voter", "projectId"])
+    project_codes, _ = pd.factorize(votes["projectId"])
+    blocks = votes["blockNumber"].to_numpy(dtype=np.int64)
+
+    order = np.lexsort((blocks, project_codes))
+    project_codes, blocks = project_codes[order], blocks[order]
+    # Keys keep projects apart so a window never runs into the next project
+    keys = project_codes.astype(np.int64) * (blocks.max() + window + 1) + blocks
+    ends = np.searchsorted(keys, keys + window, side="right")
+    starts = np.flatnonzero(ends - np.arange(len(keys)) >= min_burst)
+
+    coverage = np.zeros(len(keys) + 1, dtype=np.int64)
+    np.add.at(coverage, starts, 1)
+    np.add.at(coverage, ends[starts], -1)
+    in_burst = np.cumsum(coverage[:-1]) > 0
+    new_project = np.r_[True, project_codes[1:] != project_codes[:-1]]
+    opens = in_burst & (new_project | ~np.r_[False, in_burst[:-1]])
+    episodes = np.where(in_burst, np.cumsum(opens) - 1, -1)
+
+    return pd.DataFrame({"voter": votes["voter"].to_numpy()[order], "episode": episodes})
+
+
+def burst_groups(voting_data, min_shared=MIN_SHARED_BURSTS, max_burst=MAX_BURST):
+    """Groups of voters that burst together on at least min_shared projects, via union-find."""
+    episodes = burst_episodes(voting_data)
+    episodes = episodes[episodes["episode"] >= 0]
+    sizes = episodes["episode"].map(episodes["episode"].value_counts())
+    episodes = episodes[sizes <= max_burst]
+    if episodes.empty:
+        return []
+
+    voter_codes, voters = pd.factorize(episodes["voter"])
+    episode_codes, _ = pd.factorize(episodes["episode"])
+    membership = csr_matrix(
+        (np.ones(len(episodes), dtype=np.int32), (voter_codes, episode_codes)),
+        shape=(len(voters), episode_codes.max() + 1),
+    )
+    # Shared episodes per voter pair; an episode is one project so this counts projects
+    shared = (membership @ membership.T).tocoo()
+    linked = (shared.row < shared.col) & (shared.data >= min_shared)
+
+    union_find = UnionFind(len(voters))
+    for a, b in zip(shared.row[linked], shared.col[linked]):
+        union_find.union(a, b)
+    labels = union_find.labels()
+    groups = {}
+    for row in np.unique(np.r_[shared.row[linked], shared.col[linked]]):
+        groups.setdefault(labels[row], []).append(voters[row])
+    return list(groups.values())
+
+
+def detect_bursts(voting_data, round_id):
+    groups = burst_groups(voting_data)
+    print(f"{len(groups)} burst groups")
+    burst_json = {f"Cluster Group {i}": group for i, group in enumerate(groups)}
+
+    storage.write_json(f"review_db/{round_id}/burst_clusters.json", burst_json)
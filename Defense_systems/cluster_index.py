@@ -0,0 +1,235 @@
+# ----------------------------------------------------------------------
+# Imports
+# ----------------------------------------------------------------------
+import os
+import json
+import numpy as np
+import pandas as pd
+from Defense_systems.similarity_engine import normalize, threshold_neighbors, merge_tree, cut_tree, row_hashes, top_k_neighbors, update_top_k
+from Defense_systems.neighbor_index import TOP_K
+from utils.config import CACHE_DIR
+
+# ----------------------------------------------------------------------
+# Constants
+# ----------------------------------------------------------------------
+SIMILARITY_DIR = os.path.join(CACHE_DIR, "similarity")
+REBUILD_GROWTH = 2.0  # refit the scaler once the round has grown this much since the last fit
+
+
+def encode_stable(values, vocabulary):
+    """Label codes that never change once given; unseen values get the next codes in sorted order."""
+    keys = values.astype(str)
+    for key in sorted(set(keys) - vocabulary.keys()):
+        vocabulary[key] = len(vocabulary)
+    return keys.map(vocabulary).to_numpy()
+
+# ----------------------------------------------------------------------
+# Per-round similarity state kept between refreshes of an active round
+# ----------------------------------------------------------------------
+class ClusterIndex:
+    """
+        Keeps the frozen min-max scaling, the stable label encodings, every
+        voter's raw and normalized feature row and the neighbour edges with
+        their similarities under .cache/similarity/<round_id>. Edges are
+        searched down to a floor so any threshold above it can be cut from
+        the merge tree without searching again. A refresh only searches
+        neighbours for new voters and voters whose features changed,
+        replacing the edges of the changed ones. A row whose quantized vector
+        hashes like an existing representative is linked to it with one
+        edge instead of being searched, and only representatives are search
+        targets, so duplicate-heavy rounds stay small. Each voter's TOP_K
+        most similar voters are kept too and updated from the same changes.
+        The scaling is refit from scratch when the feature columns or floor
+        change, or the round outgrows REBUILD_GROWTH.
+    """
+
+    def __init__(self, round_id, root=SIMILARITY_DIR):
+        self.dir = os.path.join(root, str(round_id))
+        self.meta = {"columns": None, "floor": None, "fitted_rows": 0, "min": None, "scale": None, "encodings": {}}
+        self.voters = np.array([], dtype=object)
+        self.raw = self.matrix = None
+        self.edges = np.empty((0, 2), dtype=np.int64)
+        self.scores = np.empty(0, dtype=np.float32)
+        self.reps = np.empty(0, dtype=np.int64)
+        self.hashes = np.empty(0, dtype=np.uint64)
+        self.top_neighbors = self.top_scores = None
+        self.load()
+
+    @property
+    def encodings(self):
+        return self.meta["encodings"]
+
+    def _path(self, name):
+        return os.path.join(self.dir, name)
+
+    def load(self):
+        if not os.path.exists(self._path("meta.json")):
+            return
+        with open(self._path("meta.json")) as f:
+            self.meta = json.load(f)
+        self.voters = np.load(self._path("voters.npy"), allow_pickle=True)
+        self.raw = np.load(self._path("raw.npy"))
+        self.matrix = np.load(self._path("matrix.npy"))
+        self.edges = np.load(self._path("edges.npy"))
+        self.scores = np.load(self._path("scores.npy"))
+        self.reps = np.load(self._path("reps.npy"))
+        self.hashes = np.load(self._path("hashes.npy"))
+        # Absent in indexes saved before neighbour lists were kept, computed on the next update
+        if os.path.exists(self._path("top_neighbors.npy")):
+            self.top_neighbors = np.load(self._path("top_neighbors.npy"))
+            self.top_scores = np.load(self._path("top_scores.npy"))
+
+    def save(self):
+        os.makedirs(self.dir, exist_ok=True)
+        for name, array in (("voters", self.voters), ("raw", self.raw), ("matrix", self.matrix), ("edges", self.edges), ("scores", self.scores), ("reps", self.reps), ("hashes", self.hashes), ("top_neighbors", self.top_neighbors), ("top_scores", self.top_scores)):
+            with open(self._path(f"{name}.npy.tmp"), "wb") as f:
+                np.save(f, array)
+            os.replace(self._path(f"{name}.npy.tmp"), self._path(f"{name}.npy"))
+        # meta.json goes last, a crash before it leaves the previous state readable
+        with open(self._path("meta.json.tmp"), "w") as f:
+            json.dump(self.meta, f)
+        os.replace(self._path("meta.json.tmp"), self._path("meta.json"))
+
+    def _scale(self, raw):
+        return normalize(raw * np.array(self.meta["scale"]) + np.array(self.meta["min"]))
+
+    def _fit(self, raw):
+        data_min, data_max = raw.min(axis=0), raw.max(axis=0)
+        data_range = data_max - data_min
+        data_range[data_range == 0] = 1  # constant columns scale like MinMaxScaler
+        self.meta["scale"] = (1 / data_range).tolist()
+        self.meta["min"] = (-data_min / data_range).tolist()
+        self.meta["fitted_rows"] = len(raw)
+
+    def _assign(self, rows):
+        """Points duplicate rows at an existing representative; returns (rows left to search, duplicate edges)."""
+        searched = set(rows.tolist())
+        nonzero = np.any(self.matrix != 0, axis=1)
+        representatives = {
+            self.hashes[row]: row for row in np.flatnonzero((self.reps == np.arange(len(self.reps))) & nonzero)
+            if row not in searched
+        }
+        to_search, duplicates = [], []
+        for row in np.sort(rows):
+            representative = representatives.get(self.hashes[row]) if nonzero[row] else None
+            if representative is None:
+                self.reps[row] = row
+                if nonzero[row]:
+                    representatives[self.hashes[row]] = row
+                    to_search.append(row)
+            else:
+                self.reps[row] = representative
+                duplicates.append(sorted((representative, row)))
+        return np.array(to_search, dtype=np.int64), np.array(duplicates, dtype=np.int64).reshape(-1, 2)
+
+    def _search(self, rows, floor):
+        """Edges (row, neighbour) and similarities from the given rows to every representative."""
+        targets = np.flatnonzero((self.reps == np.arange(len(self.reps))) & np.any(self.matrix != 0, axis=1))
+        skip = np.ones(len(targets), dtype=bool)
+        skip[np.searchsorted(targets, rows)] = False
+        edges, scores = [], []
+        for row, neighbors, similarities in threshold_neighbors(self.matrix[targets], floor, skip=skip, scores=True):
+            edges.append(np.column_stack([np.full(len(neighbors), targets[row]), targets[neighbors]]))
+            scores.append(similarities)
+        if not edges:
+            return np.empty((0, 2), dtype=np.int64), np.empty(0, dtype=np.float32)
+        edges, scores = np.concatenate(edges), np.concatenate(scores)
+        keep = edges[:, 0] != edges[:, 1]
+        return np.sort(edges[keep], axis=1), scores[keep]
+
+    def _add_edges(self, edges, scores):
+        edges, scores = np.vstack([self.edges, edges]), np.concatenate([self.scores, scores])
+        edges, first = np.unique(edges, axis=0, return_index=True)
+        self.edges, self.scores = edges, scores[first]
+
+    def update(self, feature_dataset, floor):
+        """Brings the index up to date with feature_dataset and returns the number of representatives searched."""
+        columns = list(feature_dataset.columns[1:])
+        voters = feature_dataset["voter"].to_numpy()
+        raw = feature_dataset[columns].to_numpy(dtype=np.float64)
+
+        rebuild = (
+            self.matrix is None
+            or self.meta["columns"] != columns
+            or self.meta["floor"] != floor
+            or len(set(voters) | set(self.voters)) > REBUILD_GROWTH * self.meta["fitted_rows"]
+        )
+        if rebuild:
+            self.voters, self.raw = voters, raw
+            self._fit(raw)
+            self.meta.update(columns=columns, floor=floor)
+            self.matrix = self._scale(raw)
+            self.edges = np.empty((0, 2), dtype=np.int64)
+            self.scores = np.empty(0, dtype=np.float32)
+            self.reps = np.arange(len(voters))
+            self.hashes = row_hashes(self.matrix)
+            searched = np.arange(len(voters))
+            updated = None
+        else:
+            positions = pd.Series(np.arange(len(self.voters)), index=self.voters)
+            known = positions.reindex(voters).to_numpy()
+            is_new = np.isnan(known)
+            existing_rows = known[~is_new].astype(np.int64)
+            changed = existing_rows[(self.raw[existing_rows] != raw[~is_new]).any(axis=1)]
+            self.raw[existing_rows] = raw[~is_new]
+            self.matrix[changed] = self._scale(self.raw[changed])
+
+            new_rows = np.arange(len(self.voters), len(self.voters) + is_new.sum())
+            self.voters = np.concatenate([self.voters, voters[is_new]])
+            self.raw = np.vstack([self.raw, raw[is_new]])
+            self.matrix = np.vstack([self.matrix, self._scale(raw[is_new])])
+            self.reps = np.concatenate([self.reps, new_rows])
+            self.hashes = np.concatenate([self.hashes, np.zeros(len(new_rows), dtype=np.uint64)])
+            updated = np.concatenate([changed, new_rows])
+            self.hashes[updated] = row_hashes(self.matrix[updated])
+
+            # Changed voters, and duplicates that pointed at one, lose their edges and are searched again
+            dependents = np.flatnonzero(np.isin(self.reps, changed))
+            searched = np.union1d(np.union1d(changed, dependents), new_rows)
+            stale = np.isin(self.edges, searched).any(axis=1)
+            self.edges, self.scores = self.edges[~stale], self.scores[~stale]
+
+        if updated is None or self.top_neighbors is None:
+            self.top_neighbors, self.top_scores = top_k_neighbors(self.matrix, TOP_K)
+        else:
+            self.top_neighbors, self.top_scores = update_top_k(self.matrix, self.top_neighbors, self.top_scores, updated, TOP_K)
+
+        to_search = searched
+        if len(searched):
+            to_search, duplicates = self._assign(searched)
+            self._add_edges(duplicates, np.ones(len(duplicates), dtype=np.float32))
+            if len(to_search):
+                self._add_edges(*self._search(to_search, floor))
+        self.save()
+        return len(to_search)
+
+    def merge_tree(self):
+        """Single-linkage merges as voter_a, voter_b, similarity, most similar first."""
+        merges, similarities = merge_tree(len(self.voters), self.edges, self.scores)
+        return pd.DataFrame({
+            "voter_a": self.voters[merges[:, 0]] if len(merges) else [],
+            "voter_b": self.voters[merges[:, 1]] if len(merges) else [],
+            "similarity": similarities,
+        })
+
+    def clusters(self, threshold, voters=None):
+        """Single-linkage groups at threshold with more than one voter, limited to the given voters."""
+        merges, similarities = merge_tree(len(self.voters), self.edges, self.scores)
+        present = np.ones(len(self.voters), dtype=bool) if voters is None else np.isin(self.voters, list(voters))
+        return tree_groups(self.voters, merges, similarities, threshold, present)
+
+
+def tree_groups(voters, merges, similarities, threshold, present=None):
+    """Groups of more than one voter left when merges below threshold are undone."""
+    labels = cut_tree(len(voters), merges, similarities, threshold)
+    groups = {}
+    for row in np.flatnonzero(present) if present is not None else range(len(voters)):
+        groups.setdefault(labels[row], []).append(voters[row])
+    return [group for group in groups.values() if len(group) > 1]
+
+
+def groups_from_tree(tree, threshold):
+    """tree_groups for a merge tree read back as a DataFrame."""
+    voters, codes = np.unique(np.concatenate([tree["voter_a"], tree["voter_b"]]), return_inverse=True)
+    merges = codes.reshape(2, -1).T
+    return tree_groups(voters, merges, tree["similarity"].to_numpy(), threshold)
@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+from scipy.sparse import csr_matrix
+from Defense_systems.similarity_engine import UnionFind
+from utils.storage import storage
+
+# ----------------------------------------------------------------------
+# Constants
+# ----------------------------------------------------------------------
+NUM_PERM = 64
+BANDS = 16  # 16 bands of 4 rows: pairs above ~0.8 Jaccard collide in some band almost surely
+JACCARD_THRESHOLD = 0.8
+MIN_PROJECTS = 3  # smaller project sets overlap by chance too easily
+PRIME = (1 << 61) - 1
+PERM_CHUNK = 8  # permutations hashed at once, bounds memory to PERM_CHUNK x votes
+
+
+def voter_projects(voting_data):
+    """Binary sparse voter x project matrix and the voter of each row."""
+    pairs = voting_data[["voter", "projectId"]].drop_duplicates()
+    voter_codes, voters = pd.factorize(pairs["voter"])
+    project_codes, projects = pd.factorize(pairs["projectId"])
+    matrix = csr_matrix(
+        (np.ones(len(pairs), dtype=np.int32), (voter_codes, project_codes)), shape=(len(voters), len(projects))
+    )
+    matrix.sort_indices()
+    return matrix, np.asarray(voters)
+
+
+def minhash(matrix, num_perm=NUM_PERM, seed=0):
+    """(num_perm, rows) MinHash signatures of the rows' project sets, rows must be non-empty."""
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, PRIME, num_perm, dtype=np.int64).astype(object)
+    b = rng.integers(0, PRIME, num_perm, dtype=np.int64).astype(object)
+    projects = np.arange(matrix.shape[1], dtype=object)
+    # Hash every project once per permutation, then take row minima over the CSR layout
+    project_hashes = np.array([(a_i * projects + b_i) % PRIME for a_i, b_i in zip(a, b)], dtype=np.uint64)
+    signatures = np.empty((num_perm, matrix.shape[0]), dtype=np.uint64)
+    for start in range(0, num_perm, PERM_CHUNK):
+        chunk = project_hashes[start:start + PERM_CHUNK][:, matrix.indices]
+        signatures[start:start + PERM_CHUNK] = np.minimum.reduceat(chunk, matrix.indptr[:-1], axis=1)
+    return signatures
+
+
+def candidate_pairs(signatures, bands=BANDS):
+    """Rows sharing a band bucket, linked to the bucket's first row so a bucket costs its size."""
+    rows_per_band = len(signatures) // bands
+    pairs = []
+    for band in range(bands):
+        keys = pd.util.hash_pandas_object(
+            pd.DataFrame(signatures[band * rows_per_band:(band + 1) * rows_per_band].T), index=False
+        ).to_numpy()
+        # factorize numbers buckets in order of appearance, so return_index is each bucket's first row
+        codes, _ = pd.factorize(keys)
+        _, first = np.unique(codes, return_index=True)
+        members = np.flatnonzero(first[codes] != np.arange(len(codes)))
+        pairs.append(np.column_stack([first[codes[members]], members]))
+    pairs = np.concatenate(pairs) if pairs else np.empty((0, 2), dtype=np.int64)
+    return np.unique(pairs, axis=0)
+
+
+def jaccard(matrix, pairs):
+    sizes = np.diff(matrix.indptr)
+    overlap = np.asarray(matrix[pairs[:, 0]].multiply(matrix[pairs[:, 1]]).sum(axis=1)).ravel()
+    return overlap / (sizes[pairs[:, 0]] + sizes[pairs[:, 1]] - overlap)
+
+
+def covoting_groups(voting_data, threshold=JACCARD_THRESHOLD):
+    """
+        Groups of voters whose project sets overlap by at least threshold
+        (Jaccard), found through MinHash LSH and confirmed on the exact sets.
+        Groups are the union-find components of the confirmed pairs.
+    """
+    matrix, voters = voter_projects(voting_data)
+    eligible = np.flatnonzero(np.diff(matrix.indptr) >= MIN_PROJECTS)
+    if len(eligible) < 2:
+        return []
+    matrix, voters = matrix[eligible], voters[eligible]
+    pairs = candidate_pairs(minhash(matrix))
+    if len(pairs) == 0:
+        return []
+    pairs = pairs[jaccard(matrix, pairs) >= threshold]
+
+    union_find = UnionFind(len(voters))
+    for a, b in pairs:
+        union_find.union(a, b)
+    labels = union_find.labels()
+    groups = {}
+    for row in np.unique(pairs):
+        groups.setdefault(labels[row], []).append(voters[row])
+    return list(groups.values())
+
+
+def detect_covoting(voting_data, round_id, threshold=JACCARD_THRESHOLD):
+    groups = covoting_groups(voting_data, threshold)
+    print(f"{len(groups)} co-voting groups")
+    covoting_json = {f"Cluster Group {i}": group for i, group in enumerate(groups)}
+
+    storage.write_json(f"review_db/{round_id}/covoting_clusters.json", covoting_json)
@@ -0,0 +1,98 @@
+# ----------------------------------------------------------------------
+# Constants
+# ----------------------------------------------------------------------
+MAX_HOPS = 2  # transfers between a grant wallet and a voter
+FAN_OUT = 10  # non-voter recipients followed to the next hop per wallet, earliest transfers first
+ACTIONS = ("txlist", "tokentx")
+
+# ----------------------------------------------------------------------
+# Bounded-depth fund-flow tracing from grant wallets to voters
+# ----------------------------------------------------------------------
+class FundFlowTracer:
+    """
+        Breadth-first crawl of outgoing native and ERC-20 transfers starting
+        at the grant wallets. Each hop only follows transfers made after the
+        one that reached the wallet and stops at voters. Every recipient is
+        checked against the voters, but only the first fan_out non-voter
+        recipients of a wallet are followed to the next hop. Every wallet's history is fetched once
+        and shared by all grants, and each hop's frontier is fetched
+        concurrently through the Arbiscan client.
+    """
+
+    def __init__(self, client, startblock, inspect_point, max_hops=MAX_HOPS, fan_out=FAN_OUT):
+        self.client = client
+        self.startblock = startblock
+        self.inspect_point = inspect_point
+        self.max_hops = max_hops
+        self.fan_out = fan_out
+        self.histories = {}
+
+    def _fetch(self, job):
+        address, action = job
+        return self.client.get({
+            "module": "account",
+            "action": action,
+            "address": address,
+            "startblock": self.startblock,
+            "endblock": 99999999,
+            "sort": "asc",
+        })
+
+    def prefetch(self, addresses):
+        """Caches the outgoing transfers of every address not seen yet."""
+        jobs = [(address, action) for address in set(addresses) - set(self.histories) for action in ACTIONS]
+        transfers = {address: [] for address, _ in jobs}
+        for (address, action), response, error in self.client.map(self._fetch, jobs):
+            if error is not None:
+                raise error
+            for transaction in response:
+                timestamp = int(transaction["timeStamp"])
+                if transaction["from"].lower() == address and transaction["to"] and timestamp >= self.inspect_point:
+                    transfers[address].append((timestamp, transaction["to"].lower(), action))
+        for address, outgoing in transfers.items():
+            self.histories[address] = sorted(outgoing)
+
+    def recipients(self, address, since):
+        """Distinct (recipient, timestamp, action) sent after since, earliest first."""
+        seen = {}
+        for timestamp, recipient, action in self.histories.get(address, []):
+            if timestamp >= since and recipient != address and recipient not in seen:
+                seen[recipient] = (timestamp, action)
+        return [(recipient, timestamp, action) for recipient, (timestamp, action) in seen.items()]
+
+    def trace(self, grants, voters):
+        """
+            Returns {grant: [{"voter", "hops", "path", "via"}]} for every voter
+            reachable within max_hops of a grant, shortest path first.
+        """
+        voters = {voter.lower() for voter in voters}
+        grants = [grant.lower() for grant in grants]
+        # One BFS per grant, advanced hop by hop together so fetches batch up
+        frontiers = {grant: [(grant, self.inspect_point, [grant], [])] for grant in grants}
+        visited = {grant: {grant} for grant in grants}
+        found = {grant: [] for grant in grants}
+
+        for hop in range(1, self.max_hops + 1):
+            self.prefetch(address for frontier in frontiers.values() for address, _, _, _ in frontier)
+            for grant in grants:
+                next_frontier = []
+                for address, since, path, via in frontiers[grant]:
+                    followed = 0
+                    for recipient, timestamp, action in self.recipients(address, since):
+                        if recipient in visited[grant]:
+                            continue
+                        if recipient in voters:
+                            visited[grant].add(recipient)
+                            found[grant].append({
+                                "voter": recipient,
+                                "hops": hop,
+                                "path": path + [recipient],
+                                "via": via + [action],
+                            })
+                        elif hop < self.max_hops and followed < self.fan_out:
+                            # fan_out only bounds the wallets crawled next
+                            visited[grant].add(recipient)
+                            followed += 1
+                            next_frontier.append((recipient, timestamp, path + [recipient], via + [action]))
+                frontiers[grant] = next_frontier
+        return found
@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+from Defense_systems.similarity_engine import UnionFind
+from utils.storage import storage
+
+# ----------------------------------------------------------------------
+# Constants
+# ----------------------------------------------------------------------
+MAX_FAN_OUT = 50  # funders of more voters than this are exchanges, bridges or faucets
+NOT_FUNDERS = ["", "0", "self"]
+
+
+def load_funding(round_ids):
+    """voter, first_from and round of every round_user_info parquet that exists."""
+    # One listing instead of a request per round, most rounds have no file
+    stored = set(storage.list("round_user_info"))
+    frames = []
+    for round_id in round_ids:
+        path = f"round_user_info/{round_id}.parquet"
+        if path not in stored:
+            continue
+        frame = storage.read_parquet(path, columns=["voter", "first_from"])
+        if frame is not None:
+            frames.append(frame.assign(round_id=round_id))
+    if not frames:
+        return pd.DataFrame(columns=["voter", "first_from", "round_id"])
+    funding = pd.concat(frames, ignore_index=True)
+    funding["first_from"] = funding["first_from"].astype(str)
+    return funding
+
+
+def funder_groups(funding, max_fan_out=MAX_FAN_OUT):
+    """
+        Voters joined through shared first funders, including chains where a
+        funder is itself a voter funded by someone else. Funders of more than
+        max_fan_out voters are dropped before linking. Returns voter groups.
+    """
+    edges = funding.drop_duplicates(subset="voter")[["voter", "first_from"]]
+    edges = edges[~edges["first_from"].isin(NOT_FUNDERS) & (edges["first_from"] != edges["voter"])]
+    fan_out = edges.groupby("first_from")["voter"].transform("size")
+    edges = edges[fan_out <= max_fan_out]
+    if edges.empty:
+        return []
+
+    codes, nodes = pd.factorize(pd.concat([edges["voter"], edges["first_from"]], ignore_index=True))
+    voter_codes, funder_codes = codes[:len(edges)], codes[len(edges):]
+    union_find = UnionFind(len(nodes))
+    for voter, funder in zip(voter_codes, funder_codes):
+        union_find.union(voter, funder)
+    labels = union_find.labels()
+
+    # Only voters are reported, a component needs two of them to be a group
+    nodes = np.asarray(nodes)
+    is_voter = np.isin(nodes, funding["voter"].unique())
+    grouped = pd.Series(nodes[is_voter]).groupby(labels[is_voter]).agg(list)
+    return [group for group in grouped if len(group) > 1]
+
+
+def detect_common_funders(round_ids, round_id):
+    funding = load_funding(round_ids)
+    round_voters = set(funding.loc[funding["round_id"] == round_id, "voter"])
+    # Cross-round members are kept, only groups touching this round are published
+    groups = [group for group in funder_groups(funding) if round_voters.intersection(group)]
+    print(f"{len(groups)} common funder groups across {funding['round_id'].nunique()} rounds")
+    funder_json = {f"Cluster Group {i}": group for i, group in enumerate(groups)}
+
+    storage.write_json(f"review_db/{round_id}/funder_clusters.json", funder_json)
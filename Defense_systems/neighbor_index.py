@@ -0,0 +1,82 @@
+# ----------------------------------------------------------------------
+# Imports
+# ----------------------------------------------------------------------
+import io
+import os
+import numpy as np
+import streamlit as st
+from utils.address import canonical
+from utils.config import CACHE_DIR
+from utils.storage import storage
+
+# ----------------------------------------------------------------------
+# Constants
+# ----------------------------------------------------------------------
+TOP_K = 20
+NEIGHBOR_DIR = os.path.join(CACHE_DIR, "neighbors")
+REFRESH_AFTER = 5 * 60  # seconds before the local copy is checked against the repo
+
+# ----------------------------------------------------------------------
+# Per-round top-k neighbour index
+# ----------------------------------------------------------------------
+def build_neighbor_index(neighbors, scores, voters, present=None):
+    """
+        One structured record per voter, sorted by address so a lookup is a
+        binary search: the voter, the rows of its most similar voters and
+        their cosine similarities. neighbors and scores are the top-k lists
+        kept by ClusterIndex; only voters flagged in present are indexed,
+        and lists losing absent voters are padded with row -1. A single .npy
+        file memory-maps as is.
+    """
+    present = np.ones(len(voters), dtype=bool) if present is None else np.asarray(present, dtype=bool)
+    keep = np.flatnonzero(present)
+    remap = np.full(len(voters), -1, dtype=np.int32)
+    remap[keep] = np.arange(len(keep))
+    neighbors, scores = remap[neighbors[keep]], scores[keep]
+    # Present neighbours first, in their original order
+    first = np.argsort(neighbors < 0, axis=1, kind="stable")
+    neighbors, scores = np.take_along_axis(neighbors, first, axis=1), np.take_along_axis(scores, first, axis=1)
+    scores[neighbors < 0] = 0
+    voters = np.asarray(canonical(np.asarray(voters)[keep])).astype(str)
+    order = np.argsort(voters, kind="stable")
+    position = np.empty(len(order), dtype=np.int32)
+    position[order] = np.arange(len(order))
+    width = max((len(voter) for voter in voters), default=1)
+    index = np.zeros(len(voters), dtype=[
+        ("voter", f"S{width}"),
+        ("neighbors", "<i4", (neighbors.shape[1],)),
+        ("scores", "<f4", (neighbors.shape[1],)),
+    ])
+    index["voter"] = voters[order].astype(f"S{width}")
+    index["neighbors"] = np.where(neighbors[order] < 0, -1, position[neighbors[order]])
+    index["scores"] = scores[order]
+    return index
+
+
+def publish_neighbor_index(index, round_id):
+    buffer = io.BytesIO()
+    np.save(buffer, index)
+    storage.write_if_changed(f"review_db/{round_id}/neighbors.npy", buffer.getvalue())
+
+
+@st.cache_resource(ttl=REFRESH_AFTER)
+def load_neighbor_index(round_id):
+    """Memory-mapped neighbour index of the round, downloaded when the local copy is stale; None if unpublished."""
+    path = storage.local_copy(f"review_db/{round_id}/neighbors.npy", os.path.join(NEIGHBOR_DIR, f"{round_id}.npy"), REFRESH_AFTER)
+    if path is None:
+        return None
+    return np.load(path, mmap_mode="r")
+
+
+def similar_voters(index, address, limit=TOP_K):
+    """[(voter, similarity)] closest to address, or None when it isn't in the index."""
+    key = canonical([address])[0].strip().encode()
+    row = int(np.searchsorted(index["voter"], key))
+    if row == len(index) or index["voter"][row] != key:
+        return None
+    record = index[row]
+    return [
+        (index["voter"][neighbor].decode(), float(score))
+        for neighbor, score in zip(record["neighbors"][:limit], record["scores"][:limit])
+        if neighbor >= 0
+    ]
@@ -0,0 +1,187 @@
+import numpy as np
+import pandas as pd
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from threadpoolctl import threadpool_limits
+from utils.config import SIMILARITY_MEMORY_MB, SIMILARITY_WORKERS
+
+QUANTUM = 1e-6  # normalized components this close are the same for any usable threshold
+
+# ----------------------------------------------------------------------
+# Blocked cosine similarity without the dense n x n matrix
+# ----------------------------------------------------------------------
+def normalize(data):
+    """float32 rows scaled to unit length; all-zero rows stay zero like cosine_similarity."""
+    matrix = np.ascontiguousarray(data, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return matrix / norms
+
+
+def block_rows(n, memory_mb=SIMILARITY_MEMORY_MB, workers=SIMILARITY_WORKERS):
+    """Rows per block so the similarity blocks in flight fit in the budget."""
+    return max(1, int(memory_mb * 2**20 // (max(n, 1) * 4 * max(workers, 1))))
+
+
+def _block_neighbors(matrix, rows, threshold):
+    similarities = matrix[rows] @ matrix.T
+    hits_row, hits_col = np.nonzero(similarities >= threshold)
+    splits = np.searchsorted(hits_row, np.arange(1, len(rows)))
+    return rows, np.split(hits_col, splits), np.split(similarities[hits_row, hits_col], splits)
+
+
+def threshold_neighbors(matrix, threshold, skip=None, memory_mb=SIMILARITY_MEMORY_MB, workers=SIMILARITY_WORKERS, scores=False):
+    """
+        Yields (row, neighbor indices) in row order for every row of the
+        normalized matrix, with neighbors at cosine similarity >= threshold,
+        or (row, neighbor indices, similarities) when scores is set.
+        Blocks are computed on a thread pool with a bounded look-ahead, so at
+        most `workers` similarity blocks exist at once. Rows whose skip flag
+        is set by the caller before their block is submitted are not computed.
+    """
+    n = len(matrix)
+    size = block_rows(n, memory_mb, workers)
+    skip = np.zeros(n, dtype=bool) if skip is None else skip
+    starts = iter(range(0, n, size))
+
+    # BLAS threads would compete with the pool, one per worker instead
+    with threadpool_limits(limits=1, user_api="blas"), ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+
+        def submit():
+            for start in starts:
+                rows = np.flatnonzero(~skip[start:start + size]) + start
+                if len(rows):
+                    pending.append(pool.submit(_block_neighbors, matrix, rows, threshold))
+                    return
+
+        for _ in range(workers):
+            submit()
+        while pending:
+            rows, neighbors, similarities = pending.popleft().result()
+            submit()
+            for row, row_neighbors, row_similarities in zip(rows, neighbors, similarities):
+                yield (int(row), row_neighbors, row_similarities) if scores else (int(row), row_neighbors)
+
+
+def _block_top_k(matrix, rows, k, out, neighbors, scores):
+    similarities = matrix[rows] @ matrix.T
+    similarities[np.arange(len(rows)), rows] = -np.inf  # a row is not its own neighbour
+    top = np.argpartition(-similarities, k - 1, axis=1)[:, :k]
+    top_scores = np.take_along_axis(similarities, top, axis=1)
+    order = np.argsort(-top_scores, axis=1, kind="stable")
+    neighbors[out] = np.take_along_axis(top, order, axis=1)
+    scores[out] = np.take_along_axis(top_scores, order, axis=1)
+
+
+def top_k_neighbors(matrix, k, rows=None, memory_mb=SIMILARITY_MEMORY_MB, workers=SIMILARITY_WORKERS):
+    """
+        The k most similar other rows of every row of the normalized matrix
+        (or only of rows, in that order), as (indices, similarities) arrays
+        of shape (len(rows), k) sorted by similarity. Computed block by block
+        like threshold_neighbors, with argpartition keeping each block's
+        selection linear in n.
+    """
+    n = len(matrix)
+    rows = np.arange(n) if rows is None else np.asarray(rows, dtype=np.int64)
+    k = max(0, min(k, n - 1))
+    neighbors = np.zeros((len(rows), k), dtype=np.int32)
+    scores = np.zeros((len(rows), k), dtype=np.float32)
+    if k == 0 or len(rows) == 0:
+        return neighbors, scores
+    size = block_rows(n, memory_mb, workers)
+    with threadpool_limits(limits=1, user_api="blas"), ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(
+            lambda start: _block_top_k(matrix, rows[start:start + size], k, slice(start, start + size), neighbors, scores),
+            range(0, len(rows), size),
+        ))
+    return neighbors, scores
+
+
+def update_top_k(matrix, neighbors, scores, updated, k, memory_mb=SIMILARITY_MEMORY_MB, workers=SIMILARITY_WORKERS):
+    """
+        top_k_neighbors of matrix from the lists of its previous version,
+        where updated are the rows that changed or were appended since.
+        Updated rows, and rows whose list held a changed row, are searched
+        against every row; every other row only scores the updated rows and
+        merges them into its list, so the cost grows with the updates.
+    """
+    n, old = len(matrix), len(neighbors)
+    k = max(0, min(k, n - 1))
+    if neighbors.shape[1] != k:
+        return top_k_neighbors(matrix, k, memory_mb=memory_mb, workers=workers)
+    updated = np.unique(np.asarray(updated, dtype=np.int64))
+    neighbors = np.vstack([neighbors, np.zeros((n - old, k), dtype=np.int32)])
+    scores = np.vstack([scores, np.zeros((n - old, k), dtype=np.float32)])
+    if k == 0 or len(updated) == 0:
+        return neighbors, scores
+
+    research = np.union1d(updated, np.flatnonzero(np.isin(neighbors[:old], updated).any(axis=1)))
+    neighbors[research], scores[research] = top_k_neighbors(matrix, k, research, memory_mb, workers)
+
+    merge = np.setdiff1d(np.arange(old), research)
+    size = block_rows(len(updated), memory_mb, 1)
+    with threadpool_limits(limits=1, user_api="blas"):
+        for start in range(0, len(merge), size):
+            rows = merge[start:start + size]
+            candidates = np.hstack([neighbors[rows], np.broadcast_to(updated.astype(np.int32), (len(rows), len(updated)))])
+            candidate_scores = np.hstack([scores[rows], matrix[rows] @ matrix[updated].T])
+            top = np.argsort(-candidate_scores, axis=1, kind="stable")[:, :k]
+            neighbors[rows] = np.take_along_axis(candidates, top, axis=1)
+            scores[rows] = np.take_along_axis(candidate_scores, top, axis=1)
+    return neighbors, scores
+
+
+def row_hashes(matrix, quantum=QUANTUM):
+    """64-bit hash of each normalized row after rounding to the quantum."""
+    quantized = np.round(np.asarray(matrix, dtype=np.float64) / quantum).astype(np.int64)
+    return pd.util.hash_pandas_object(pd.DataFrame(quantized), index=False).to_numpy()
+
+
+# ----------------------------------------------------------------------
+# Single-linkage merge tree over neighbour edges
+# ----------------------------------------------------------------------
+class UnionFind:
+    def __init__(self, n):
+        self.parent = np.arange(n)
+
+    def find(self, x):
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(self, a, b):
+        """Joins the sets of a and b, False when they were already one."""
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return False
+        self.parent[max(root_a, root_b)] = min(root_a, root_b)
+        return True
+
+    def labels(self):
+        return np.array([self.find(x) for x in range(len(self.parent))])
+
+
+def merge_tree(n, edges, similarities):
+    """
+        Kruskal over the edges from most to least similar. The merges kept
+        form a maximum spanning forest, so the components at any threshold
+        at or above the search floor are those of its edges at or above it.
+        Returns (edges, similarities) of the merges in descending order.
+    """
+    order = np.argsort(-np.asarray(similarities), kind="stable")
+    union_find = UnionFind(n)
+    kept = [i for i in order if union_find.union(*edges[i])]
+    kept = np.array(kept, dtype=np.int64)
+    return np.asarray(edges).reshape(-1, 2)[kept], np.asarray(similarities)[kept]
+
+
+def cut_tree(n, merges, similarities, threshold):
+    """Component label of each of the n rows with merges below threshold undone."""
+    union_find = UnionFind(n)
+    # Merges are sorted by similarity so the cut is a prefix
+    for a, b in merges[:np.searchsorted(-np.asarray(similarities), -threshold, side="right")]:
+        union_find.union(a, b)
+    return union_find.labels()
@@ -0,0 +1,181 @@
+# ----------------------------------------------------------------------
+# Imports
+# ----------------------------------------------------------------------
+import io
+import os
+import numpy as np
+import pandas as pd
+import streamlit as st
+from itertools import chain
+from utils.address import to_keys
+from utils.main_db import list_segments, read_db
+from utils.config import CACHE_DIR
+from utils.storage import storage
+
+# ----------------------------------------------------------------------
+# Constants
+# ----------------------------------------------------------------------
+INDEX_FILE = "threat_index.npz"
+LOCAL_PATH = os.path.join(CACHE_DIR, "threat_index.npz")
+REFRESH_AFTER = 10 * 60  # seconds before the local copy is checked against the repo
+BLOOM_MIN_KEYS = 100_000  # smaller sets are a cheap binary search without one
+BLOOM_BITS_PER_KEY = 10
+BLOOM_HASHES = 7  # ~1% false positives at 10 bits per key
+
+# ----------------------------------------------------------------------
+# Review cluster files as key arrays
+# ----------------------------------------------------------------------
+def cluster_members(cluster_dict):
+    """Every address of a review cluster JSON in file order; a group may also be a single address."""
+    return list(chain.from_iterable(group if isinstance(group, list) else [group] for group in cluster_dict.values()))
+
+
+def cluster_keys(cluster_dict):
+    """Sorted unique keys of every address in a review cluster JSON."""
+    keys = np.unique(to_keys(cluster_members(cluster_dict)))
+    return keys[keys != b""]
+
+
+def review_keys(round_id, file_name):
+    """Keys of a round's review file, empty when it hasn't been published."""
+    return cluster_keys(storage.read_json(f"review_db/{round_id}/{file_name}", {}))
+
+
+def bloom_positions(keys, bits):
+    # Addresses are hash outputs already, so two of their words double-hash well enough
+    words = np.frombuffer(np.ascontiguousarray(keys, dtype="S20").tobytes(), dtype="<u4").reshape(-1, 5)
+    h1, h2 = words[:, 0].astype(np.uint64), words[:, 1].astype(np.uint64) | 1
+    return (h1[:, None] + np.arange(BLOOM_HASHES, dtype=np.uint64) * h2[:, None]) % np.uint64(bits)
+
+# ----------------------------------------------------------------------
+# Known threats from main_db, one vectorized lookup per round
+# ----------------------------------------------------------------------
+class ThreatIndex:
+    """
+        main_db as sorted S20 keys with a parallel threat code and reviewed
+        ('Old') flag, saved as one small .npz. Sets of BLOOM_MIN_KEYS and
+        more carry a Bloom filter that screens queries before the search.
+        segments are the main_db segment paths the index was built from.
+    """
+
+    def __init__(self, keys, threats, old, names, bloom=None, segments=()):
+        self.keys = keys
+        self.threats = threats
+        self.old = old
+        self.names = names
+        self.bloom = bloom if bloom is not None and len(bloom) else None
+        self.segments = tuple(str(segment) for segment in segments)
+
+    @classmethod
+    def from_frame(cls, db, segments=()):
+        """Last threat type per address wins, as in the parquet; flagged old if any entry is."""
+        keys = to_keys(db["address"])
+        codes, names = pd.factorize(db["Threat Type"].astype(str))
+        old = (db["entry_status"] == "Old").to_numpy() if "entry_status" in db else np.ones(len(db), dtype=bool)
+        keep = keys != b""
+        keys, codes, old = keys[keep], codes[keep], old[keep]
+
+        order = np.argsort(keys, kind="stable")
+        keys, codes, old = keys[order], codes[order], old[order]
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        last = np.r_[starts[1:], len(keys)] - 1
+        any_old = np.logical_or.reduceat(old, starts) if len(keys) else old
+
+        bloom = None
+        if len(starts) >= BLOOM_MIN_KEYS:
+            bits = len(starts) * BLOOM_BITS_PER_KEY
+            bloom = np.zeros((bits + 7) // 8, dtype=np.uint8)
+            positions = bloom_positions(keys[starts], bits).ravel()
+            np.bitwise_or.at(bloom, positions // 8, (1 << (positions % 8)).astype(np.uint8))
+        return cls(keys[starts], codes[last].astype(np.uint8), any_old, np.asarray(names, dtype=str), bloom, segments)
+
+    @classmethod
+    def load(cls, path=LOCAL_PATH):
+        with np.load(path) as data:
+            segments = data["segments"] if "segments" in data else ()
+            return cls(data["keys"], data["threats"], data["old"], data["names"], data["bloom"], segments)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def lookup(self, keys):
+        """Row of each key in the index, -1 where it isn't a known threat."""
+        rows = np.full(len(keys), -1, dtype=np.int64)
+        candidates = np.flatnonzero(keys != b"")
+        if self.bloom is not None and len(candidates):
+            bits = len(self.bloom) * 8
+            positions = bloom_positions(keys[candidates], bits)
+            hit = ((self.bloom[positions // 8] >> (positions % 8).astype(np.uint8)) & 1).all(axis=1)
+            candidates = candidates[hit]
+        if len(candidates) == 0 or len(self) == 0:
+            return rows
+        found = np.minimum(np.searchsorted(self.keys, keys[candidates]), len(self) - 1)
+        match = self.keys[found] == keys[candidates]
+        rows[candidates[match]] = found[match]
+        return rows
+
+    def contains(self, keys, old_only=False):
+        rows = self.lookup(keys)
+        known = rows >= 0
+        if old_only:
+            known[known] = self.old[rows[known]]
+        return known
+
+    def threat_types(self, keys, default="Normal"):
+        rows = self.lookup(keys)
+        types = np.full(len(keys), default, dtype=object)
+        types[rows >= 0] = self.names[self.threats[rows[rows >= 0]]]
+        return types
+
+    def to_bytes(self):
+        buffer = io.BytesIO()
+        np.savez(
+            buffer, keys=self.keys, threats=self.threats, old=self.old, names=self.names,
+            bloom=self.bloom if self.bloom is not None else np.empty(0, dtype=np.uint8),
+            segments=np.asarray(self.segments, dtype=str),
+        )
+        return buffer.getvalue()
+
+    def save(self, path=LOCAL_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(self.to_bytes())
+        os.replace(tmp, path)
+
+# ----------------------------------------------------------------------
+# Functions to load and publish the index
+# ----------------------------------------------------------------------
+def build_threat_index(segments=None):
+    segments = tuple(list_segments() if segments is None else segments)
+    return ThreatIndex.from_frame(read_db(segments), segments)
+
+
+@st.cache_resource(ttl=REFRESH_AFTER)
+def load_threat_index():
+    """
+        Loaded once per process and checked against the main_db segments
+        every REFRESH_AFTER. The local copy is used while it covers the
+        current segments, then the published one, and when both are behind
+        (deltas written since the last compaction) it is rebuilt here.
+    """
+    segments = tuple(list_segments())
+    if os.path.exists(LOCAL_PATH):
+        index = ThreatIndex.load()
+        if index.segments == segments:
+            return index
+    content = storage.read(INDEX_FILE)
+    if content is not None:
+        index = ThreatIndex.load(io.BytesIO(content))
+        if index.segments == segments:
+            index.save()
+            return index
+    index = build_threat_index(segments)
+    index.save()
+    return index
+
+
+def publish_threat_index(index):
+    index.save()
+    load_threat_index.clear()
+    storage.write(INDEX_FILE, index.to_bytes(), "Updated threat index")
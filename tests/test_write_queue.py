@@ -0,0 +1,35 @@
+import pytest
+from utils import write_queue
+
+
+@pytest.fixture(autouse=True)
+def queue(tmp_path, monkeypatch):
+    monkeypatch.setattr(write_queue, "CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(write_queue, "QUEUE_PATH", str(tmp_path / "writes.sqlite"))
+
+
+def test_write_staged_after_failed_flush_keeps_earlier_writes():
+    write_queue.stage("a", b"1", "a")
+    write_queue.failed(write_queue.claim(), "boom")
+    write_queue.stage("b", b"2", "b")
+
+    # Backoff holds the new write behind the failed batch
+    assert write_queue.claim() == []
+    assert write_queue.pending("a") == (True, b"1")
+
+    connection = write_queue.connect()
+    connection.execute("UPDATE writes SET next_attempt = 0")
+    connection.close()
+    writes = write_queue.claim()
+    assert write_queue.coalesce(writes) == {"a": b"1", "b": b"2"}
+    write_queue.done(writes)
+    assert write_queue.pending("a") == (False, None)
+    assert write_queue.status()["pending"] == 0
+
+
+def test_done_leaves_writes_staged_during_the_flush():
+    write_queue.stage("a", b"1", "a")
+    writes = write_queue.claim()
+    write_queue.stage("a", b"2", "a")
+    write_queue.done(writes)
+    assert write_queue.pending("a") == (True, b"2")
@@ -0,0 +1,112 @@
+# ----------------------------------------------------------------------
+# Imports
+# ----------------------------------------------------------------------
+import io
+import numpy as np
+import pandas as pd
+
+# ----------------------------------------------------------------------
+# Constants
+# ----------------------------------------------------------------------
+ADDRESS_COLUMNS = ["voter", "address", "first_from", "first_to", "last_from", "last_to", "voter_a", "voter_b"]
+KEY_SIZE = 20
+
+HEX_VALUES = np.full(256, 255, dtype=np.uint8)
+HEX_VALUES[np.frombuffer(b"0123456789abcdef", dtype=np.uint8)] = np.arange(16, dtype=np.uint8)
+HEX_DIGITS = np.frombuffer(b"0123456789abcdef", dtype=np.uint8)
+
+# ----------------------------------------------------------------------
+# Canonical form: 20 raw bytes, lower-case 0x hex when shown
+# ----------------------------------------------------------------------
+def to_keys(addresses, return_valid=False):
+    """
+        S20 keys of hex addresses, decoded in one vectorized pass whatever the
+        case or 0x prefix. Anything that isn't a 20-byte address gets the
+        empty key. The zero address has that key too, return_valid also
+        returns the mask of values that were addresses.
+    """
+    text = pd.Series(addresses, dtype=object).astype(str).str.strip().str.lower()
+    text = text.str.replace(r"^0x", "", regex=True)
+    keys = np.zeros(len(text), dtype=f"S{KEY_SIZE}")
+    is_address = np.zeros(len(text), dtype=bool)
+    sized = np.flatnonzero(text.str.len().to_numpy() == 2 * KEY_SIZE)
+    if len(sized) == 0:
+        return (keys, is_address) if return_valid else keys
+    raw = np.frombuffer("".join(text.iloc[sized]).encode("ascii", "replace"), dtype=np.uint8).reshape(-1, 2 * KEY_SIZE)
+    nibbles = HEX_VALUES[raw]
+    valid = (nibbles != 255).all(axis=1)
+    packed = (nibbles[:, 0::2] << 4) | nibbles[:, 1::2]
+    keys[sized[valid]] = np.ascontiguousarray(packed[valid]).view(f"S{KEY_SIZE}").ravel()
+    is_address[sized[valid]] = True
+    return (keys, is_address) if return_valid else keys
+
+
+def to_hex(keys):
+    """'0x' + lower-case hex of each S20 key."""
+    keys = np.ascontiguousarray(keys, dtype=f"S{KEY_SIZE}")
+    raw = np.frombuffer(keys.tobytes(), dtype=np.uint8).reshape(-1, KEY_SIZE)
+    digits = np.empty((len(keys), 2 + 2 * KEY_SIZE), dtype=np.uint8)
+    digits[:, 0], digits[:, 1] = ord("0"), ord("x")
+    digits[:, 2::2] = HEX_DIGITS[raw >> 4]
+    digits[:, 3::2] = HEX_DIGITS[raw & 15]
+    return digits.view(f"S{2 + 2 * KEY_SIZE}").ravel().astype(str).astype(object)
+
+
+def canonical(addresses):
+    """Lower-case 0x form of each address, values that aren't addresses are kept as they are."""
+    addresses = pd.Series(addresses, dtype=object)
+    keys, valid = to_keys(addresses, return_valid=True)
+    out = addresses.to_numpy(dtype=object).copy()
+    out[valid] = to_hex(keys[valid])
+    return out
+
+# ----------------------------------------------------------------------
+# Parquet: address columns stored as binary, 20 bytes per address
+# ----------------------------------------------------------------------
+def encode_frame(frame):
+    """
+        Copy of frame with its address columns as bytes: 20 raw bytes for an
+        address, the UTF-8 text otherwise ('self', '0', ...), None for nulls.
+        A 20-byte value is always an address, nothing else has that length.
+    """
+    frame = frame.copy()
+    for column in ADDRESS_COLUMNS:
+        if column not in frame or frame[column].dtype != object:
+            continue
+        values = frame[column].to_numpy(dtype=object)
+        keys, valid = to_keys(values, return_valid=True)
+        encoded = np.array([None if value is None else str(value).encode() for value in values], dtype=object)
+        valid = np.flatnonzero(valid)
+        encoded[valid] = [bytes(key).ljust(KEY_SIZE, b"\0") for key in keys[valid]]
+        frame[column] = encoded
+    return frame
+
+
+def decode_frame(frame):
+    """Address columns back to canonical hex, accepting binary and legacy string parquet alike."""
+    for column in ADDRESS_COLUMNS:
+        if column not in frame or frame[column].dtype != object:
+            continue
+        values = frame[column].to_numpy(dtype=object)
+        is_bytes = np.fromiter((isinstance(value, bytes) for value in values), dtype=bool, count=len(values))
+        if is_bytes.any():
+            raw = values[is_bytes]
+            is_key = np.fromiter((len(value) == KEY_SIZE for value in raw), dtype=bool, count=len(raw))
+            decoded = np.empty(len(raw), dtype=object)
+            decoded[is_key] = to_hex(np.array(list(raw[is_key]), dtype=f"S{KEY_SIZE}"))
+            decoded[~is_key] = [value.decode() for value in raw[~is_key]]
+            values = values.copy()
+            values[is_bytes] = decoded
+        frame[column] = canonical(values)
+    return frame
+
+
+def read_parquet(source, **kwargs):
+    return decode_frame(pd.read_parquet(source, **kwargs))
+
+
+def to_parquet(frame):
+    """Parquet bytes of frame with the address columns binary-encoded."""
+    buffer = io.BytesIO()
+    encode_frame(frame).to_parquet(buffer, index=False)
+    return buffer.getvalue()
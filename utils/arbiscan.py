@@ -0,0 +1,118 @@
+# ----------------------------------------------------------------------
+# Imports
+# ----------------------------------------------------------------------
+import time
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from json.decoder import JSONDecodeError
+from requests.exceptions import ConnectionError, Timeout
+from utils import http
+from utils.config import ARBISCAN_URL
+
+# ----------------------------------------------------------------------
+# Constants
+# ----------------------------------------------------------------------
+CALLS_PER_SECOND = 5
+MAX_WORKERS = 8
+MAX_RETRIES = 3
+BACKOFF_BASE = 0.5
+REQUEST_TIMEOUT = 30
+
+
+class RateLimitError(Exception):
+    """Arbiscan answered with its "Max rate limit reached" payload."""
+
+
+# ----------------------------------------------------------------------
+# Token bucket shared by every thread talking to Arbiscan
+# ----------------------------------------------------------------------
+class TokenBucket:
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity or rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def try_acquire(self):
+        with self.lock:
+            self._refill()
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+
+# ----------------------------------------------------------------------
+# Client that keeps many requests in flight under the Arbiscan quota
+# ----------------------------------------------------------------------
+class ArbiscanClient:
+    def __init__(self, api_key, url=ARBISCAN_URL, rate=CALLS_PER_SECOND, max_workers=MAX_WORKERS, max_retries=MAX_RETRIES):
+        self.api_key = api_key
+        self.url = url
+        self.bucket = TokenBucket(rate)
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+
+    def get(self, params):
+        """
+            Returns the "result" field of an Arbiscan call, retrying transport
+            errors and rate limit answers with exponential backoff.
+        """
+        params = dict(params, apikey=self.api_key)
+        for attempt in range(self.max_retries + 1):
+            self.bucket.acquire()
+            try:
+                payload = http.get(self.url, params=params, timeout=REQUEST_TIMEOUT).json()
+                result = payload["result"]
+                if payload.get("status") == "0" and isinstance(result, str) and "rate limit" in result.lower():
+                    raise RateLimitError(result)
+                return result
+            except (ConnectionError, Timeout, JSONDecodeError, RateLimitError):
+                if attempt == self.max_retries:
+                    raise
+                time.sleep(BACKOFF_BASE * 2 ** attempt + random.uniform(0, BACKOFF_BASE))
+
+    def map(self, fn, items):
+        """
+            Runs fn(item) on the worker pool and yields (item, result, error)
+            in completion order so the caller can drive a progress bar.
+        """
+        pool = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            futures = {pool.submit(fn, item): item for item in items}
+            for future in as_completed(futures):
+                try:
+                    yield futures[future], future.result(), None
+                except Exception as e:
+                    yield futures[future], None, e
+        finally:
+            # A caller that stops early should not wait for the whole queue
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+def get_client(api_key, url=ARBISCAN_URL):
+    """One client per (key, url) per process so every caller shares the quota."""
+    with _clients_lock:
+        if (api_key, url) not in _clients:
+            _clients[(api_key, url)] = ArbiscanClient(api_key, url)
+        return _clients[(api_key, url)]
@@ -0,0 +1,150 @@
+# ----------------------------------------------------------------------
+# Imports
+# ----------------------------------------------------------------------
+import io
+import os
+import glob
+import json
+import time
+import numpy as np
+from datetime import datetime
+from utils.block_time import SECONDS_PER_DAY, to_date, to_day
+from utils.config import CACHE_DIR
+from utils.storage import storage
+
+# ----------------------------------------------------------------------
+# Constants
+# ----------------------------------------------------------------------
+INDEX_FILE = "time_mappings/block_index.npy"
+LOCAL_PATH = os.path.join(CACHE_DIR, "block_index.npy")
+LEGACY_MAPPINGS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "time_mappings")
+REFRESH_AFTER = 10 * 60  # seconds before the local copy is checked against the repo
+
+# ----------------------------------------------------------------------
+# Chain-wide block -> timestamp anchors shared by every round
+# ----------------------------------------------------------------------
+class BlockIndex:
+    """
+        Two sorted int64 arrays, block numbers and their timestamps, saved as
+        one (2, n) .npy file so it can be memory-mapped. Anchors that only
+        carry a date (migrated from the per-round time_mappings JSON files)
+        are stored at that day's midnight. A block resolves to a date when it
+        is an anchor or both neighbouring anchors fall on the same UTC day.
+    """
+
+    def __init__(self, table):
+        self.table = table
+        self.blocks = table[0]
+        self.timestamps = table[1]
+
+    @classmethod
+    def empty(cls):
+        return cls(np.empty((2, 0), dtype=np.int64))
+
+    @classmethod
+    def from_arrays(cls, blocks, timestamps, exact=None):
+        """Sorts and dedups by block, an exact timestamp wins over a date-only one."""
+        blocks = np.asarray(blocks, dtype=np.int64)
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        exact = timestamps % SECONDS_PER_DAY != 0 if exact is None else np.asarray(exact)
+        order = np.lexsort((~exact, blocks))
+        blocks, timestamps = blocks[order], timestamps[order]
+        keep = np.r_[True, blocks[1:] != blocks[:-1]]
+        return cls(np.vstack([blocks[keep], timestamps[keep]]))
+
+    @classmethod
+    def load(cls, path=LOCAL_PATH):
+        return cls(np.load(path, mmap_mode="r"))
+
+    def __len__(self):
+        return self.table.shape[1]
+
+    def dates(self, blocks):
+        """datetime64[D] date for each block, NaT where the index can't tell."""
+        queries = np.asarray(blocks, dtype=np.int64)
+        out = np.full(len(queries), np.datetime64("NaT"), dtype="datetime64[D]")
+        n = len(self)
+        if n == 0:
+            return out
+        lo = np.searchsorted(self.blocks, queries, side="right") - 1
+        lo_c = np.clip(lo, 0, n - 1)
+        hi_c = np.clip(lo + 1, 0, n - 1)
+        day_lo = self.timestamps[lo_c] // SECONDS_PER_DAY
+        day_hi = self.timestamps[hi_c] // SECONDS_PER_DAY
+        exact = (lo >= 0) & (self.blocks[lo_c] == queries)
+        between = (lo >= 0) & (lo + 1 < n) & (day_lo == day_hi)
+        known = exact | between
+        out[known] = day_lo[known].astype("datetime64[D]")
+        return out
+
+    def anchors_around(self, low, high):
+        """Anchors covering [low, high] split into (known_dates, known_timestamps) for BlockDateResolver."""
+        start = max(int(np.searchsorted(self.blocks, low, side="right")) - 1, 0)
+        end = int(np.searchsorted(self.blocks, high, side="left")) + 1
+        blocks, timestamps = self.blocks[start:end], self.timestamps[start:end]
+        exact = timestamps % SECONDS_PER_DAY != 0
+        known_dates = {int(block): to_date(timestamp // SECONDS_PER_DAY) for block, timestamp in zip(blocks[~exact], timestamps[~exact])}
+        known_timestamps = dict(zip(blocks[exact].tolist(), timestamps[exact].tolist()))
+        return known_dates, known_timestamps
+
+    def extend(self, timestamps):
+        """New index with the given {block: timestamp} anchors merged in."""
+        if not timestamps:
+            return self
+        blocks = np.fromiter(timestamps.keys(), dtype=np.int64, count=len(timestamps))
+        values = np.fromiter(timestamps.values(), dtype=np.int64, count=len(timestamps))
+        return BlockIndex.from_arrays(np.r_[self.blocks, blocks], np.r_[self.timestamps, values])
+
+    def to_bytes(self):
+        buffer = io.BytesIO()
+        np.save(buffer, np.ascontiguousarray(self.table, dtype=np.int64))
+        return buffer.getvalue()
+
+    def save(self, path=LOCAL_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(self.to_bytes())
+        os.replace(tmp, path)
+
+# ----------------------------------------------------------------------
+# Function to migrate the per-round time_mappings JSON files
+# ----------------------------------------------------------------------
+def from_time_mappings(directory=LEGACY_MAPPINGS):
+    blocks, timestamps = [], []
+    for path in glob.glob(os.path.join(directory, "*.json")):
+        with open(path) as f:
+            text = f.read().strip()
+        for block, date in (json.loads(text) if text else {}).items():
+            blocks.append(int(block))
+            # Older rounds stored full ISO timestamps rather than dates
+            if len(date) > 10:
+                timestamps.append(int(datetime.fromisoformat(date.replace("Z", "+00:00")).timestamp()))
+            else:
+                timestamps.append(to_day(date) * SECONDS_PER_DAY)
+    return BlockIndex.from_arrays(blocks, timestamps) if blocks else BlockIndex.empty()
+
+# ----------------------------------------------------------------------
+# Functions to load and publish the shared index
+# ----------------------------------------------------------------------
+def load_index(refresh=False):
+    """
+        Memory-maps the local copy, pulling the published index first when
+        the copy is missing, older than REFRESH_AFTER or refresh is set.
+        Falls back to migrating the legacy JSON files if nothing is published.
+    """
+    stale = not os.path.exists(LOCAL_PATH) or time.time() - os.path.getmtime(LOCAL_PATH) > REFRESH_AFTER
+    if refresh or stale:
+        content = storage.read(INDEX_FILE)
+        if content is not None:
+            BlockIndex(np.load(io.BytesIO(content))).save()
+        elif not os.path.exists(LOCAL_PATH):
+            from_time_mappings().save()
+        else:
+            os.utime(LOCAL_PATH, None)
+    return BlockIndex.load()
+
+
+def publish_index(index):
+    index.save()
+    storage.write(INDEX_FILE, index.to_bytes(), "Updated block index")
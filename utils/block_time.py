@@ -0,0 +1,93 @@
+# ----------------------------------------------------------------------
+# Imports
+# ----------------------------------------------------------------------
+import numpy as np
+from datetime import datetime, timezone
+
+# ----------------------------------------------------------------------
+# Constants
+# ----------------------------------------------------------------------
+SECONDS_PER_DAY = 86400
+
+
+def to_date(day):
+    return datetime.fromtimestamp(int(day) * SECONDS_PER_DAY, tz=timezone.utc).strftime('%Y-%m-%d')
+
+
+def to_day(date):
+    return int(datetime.strptime(date, '%Y-%m-%d').replace(tzinfo=timezone.utc).timestamp()) // SECONDS_PER_DAY
+
+# ----------------------------------------------------------------------
+# Block number to calendar date resolver
+# ----------------------------------------------------------------------
+class BlockDateResolver:
+    """
+        Block timestamps never decrease, so every block between two anchors
+        that fall on the same UTC day is on that day too. Only blocks in
+        segments whose anchors straddle a day boundary are fetched: the
+        boundary is located by interpolating between anchor timestamps and
+        fetching the query blocks on either side of the estimate, falling
+        back to bisection when an anchor only has a date.
+
+        fetch_timestamps takes a list of block numbers and returns a dict of
+        block -> unix timestamp, so callers decide how to batch the requests.
+    """
+
+    def __init__(self, fetch_timestamps, known_dates=None, known_timestamps=None):
+        self.fetch_timestamps = fetch_timestamps
+        self.days = {int(block): to_day(date) for block, date in (known_dates or {}).items()}
+        self.timestamps = {}
+        self.fetched = 0
+        self.add_timestamps(known_timestamps or {})
+
+    def add_timestamps(self, timestamps):
+        for block, timestamp in timestamps.items():
+            self.timestamps[int(block)] = int(timestamp)
+            self.days[int(block)] = int(timestamp) // SECONDS_PER_DAY
+
+    def _fetch(self, blocks):
+        blocks = sorted(set(int(block) for block in blocks) - set(self.timestamps))
+        if blocks:
+            self.add_timestamps(self.fetch_timestamps(blocks))
+            self.fetched += len(blocks)
+
+    def _pick(self, lo, hi, inside):
+        """Query blocks to fetch inside the (lo, hi) segment."""
+        if lo in self.timestamps and hi in self.timestamps and self.timestamps[hi] > self.timestamps[lo]:
+            t_lo, t_hi = self.timestamps[lo], self.timestamps[hi]
+            boundary = (t_lo // SECONDS_PER_DAY + 1) * SECONDS_PER_DAY
+            estimate = lo + (boundary - t_lo) * (hi - lo) / (t_hi - t_lo)
+            i = int(np.searchsorted(inside, estimate))
+            return [int(block) for block in inside[max(i - 1, 0):i + 1]]
+        return [int(inside[len(inside) // 2])]
+
+    def resolve(self, blocks, progress=None):
+        """Returns {block: 'YYYY-MM-DD'} for every block given."""
+        queries = np.unique(np.asarray(list(blocks), dtype=np.int64))
+        if len(queries) == 0:
+            return {}
+        self._fetch([block for block in (queries[0], queries[-1]) if int(block) not in self.days])
+
+        while True:
+            anchors = np.array(sorted(self.days), dtype=np.int64)
+            anchor_days = np.array([self.days[block] for block in anchors], dtype=np.int64)
+
+            lo = np.searchsorted(anchors, queries, side="right") - 1
+            exact = anchors[lo] == queries
+            hi = np.where(exact, lo, np.minimum(lo + 1, len(anchors) - 1))
+            resolved = anchor_days[lo] == anchor_days[hi]
+            if progress is not None:
+                progress(int(resolved.sum()), len(queries))
+            if resolved.all():
+                return {int(block): to_date(day) for block, day in zip(queries, anchor_days[lo])}
+
+            # One wave of fetches covers every straddling segment at once
+            picks = []
+            pending_lo = lo[~resolved]
+            pending = queries[~resolved]
+            starts = np.flatnonzero(np.r_[True, pending_lo[1:] != pending_lo[:-1]])
+            ends = np.r_[starts[1:], len(pending)]
+            for start, end in zip(starts, ends):
+                segment = pending_lo[start]
+                picks.extend(self._pick(int(anchors[segment]), int(anchors[segment + 1]), pending[start:end]))
+            self._fetch(picks)
@@ -0,0 +1,100 @@
+# ----------------------------------------------------------------------
+# Imports
+# ----------------------------------------------------------------------
+import os
+import glob
+import time
+import pandas as pd
+from utils.config import CACHE_DIR
+
+# ----------------------------------------------------------------------
+# Constants
+# ----------------------------------------------------------------------
+CHECKPOINT_DIR = os.path.join(CACHE_DIR, "checkpoints")
+FAILURE_COLUMNS = ["address", "error", "message", "attempts", "failed_at"]
+
+# ----------------------------------------------------------------------
+# Durable record of an enrichment run for one round
+# ----------------------------------------------------------------------
+class Checkpoint:
+    """
+        Completed rows are appended as small parquet parts and failures kept
+        in failed.parquet, both under .cache/checkpoints/<round_id>. A run
+        that dies is resumed by skipping every address already in a part.
+    """
+
+    def __init__(self, round_id, root=CHECKPOINT_DIR):
+        self.dir = os.path.join(root, str(round_id))
+        os.makedirs(self.dir, exist_ok=True)
+        self.failures_path = os.path.join(self.dir, "failed.parquet")
+
+    def _write(self, frame, path):
+        # Write then rename so a crash never leaves a half written part behind
+        tmp = path + ".tmp"
+        frame.to_parquet(tmp, index=False)
+        os.replace(tmp, path)
+
+    def _parts(self):
+        return sorted(glob.glob(os.path.join(self.dir, "part-*.parquet")))
+
+    def completed(self):
+        parts = self._parts()
+        if not parts:
+            return pd.DataFrame()
+        rows = pd.concat([pd.read_parquet(part) for part in parts], ignore_index=True)
+        return rows.drop_duplicates(subset="voter", keep="last")
+
+    def done_addresses(self):
+        parts = self._parts()
+        if not parts:
+            return set()
+        return set(pd.concat([pd.read_parquet(part, columns=["voter"]) for part in parts])["voter"])
+
+    def add_rows(self, rows):
+        if len(rows) == 0:
+            return
+        parts = self._parts()
+        number = int(os.path.basename(parts[-1])[5:10]) + 1 if parts else 0
+        self._write(rows, os.path.join(self.dir, f"part-{number:05d}.parquet"))
+        self.clear_failures(rows["voter"])
+
+    def failures(self):
+        if not os.path.exists(self.failures_path):
+            return pd.DataFrame(columns=FAILURE_COLUMNS)
+        return pd.read_parquet(self.failures_path)
+
+    def add_failures(self, failed):
+        """failed is a list of (address, exception) pairs."""
+        if not failed:
+            return
+        previous = self.failures().set_index("address")
+        now = int(time.time())
+        new = pd.DataFrame([
+            {
+                "address": address,
+                "error": type(error).__name__,
+                "message": str(error)[:500],
+                "attempts": int(previous["attempts"].get(address, 0)) + 1,
+                "failed_at": now,
+            }
+            for address, error in failed
+        ])
+        merged = pd.concat([previous.reset_index(), new]).drop_duplicates(subset="address", keep="last")
+        self._write(merged[FAILURE_COLUMNS], self.failures_path)
+
+    def clear_failures(self, addresses):
+        failures = self.failures()
+        remaining = failures[~failures["address"].isin(set(addresses))]
+        if len(remaining) != len(failures):
+            self._write(remaining, self.failures_path)
+
+    def skipped(self, errors, within):
+        """Addresses whose last failure was one of the given error classes less than `within` seconds ago."""
+        failures = self.failures()
+        recent = failures["error"].isin(errors) & (failures["failed_at"] >= time.time() - within)
+        return set(failures.loc[recent, "address"])
+
+    def clear(self):
+        """Drops completed parts once they are published, failures are kept for the next run."""
+        for part in self._parts():
+            os.remove(part)
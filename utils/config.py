@@ -0,0 +1,36 @@
+# ----------------------------------------------------------------------
+# Imports
+# ----------------------------------------------------------------------
+import os
+
+# ----------------------------------------------------------------------
+# External endpoints, overridable so the pipeline can run against a
+# local stand-in (see utils/stub_server.py)
+# ----------------------------------------------------------------------
+ARBISCAN_URL = os.environ.get("AGDM_ARBISCAN_URL", "https://api.arbiscan.io/api")
+INDEXER_URL = os.environ.get("AGDM_INDEXER_URL", "https://grants-stack-indexer.gitcoin.co")
+RAW_URL = os.environ.get("AGDM_RAW_URL", "https://raw.githubusercontent.com/G-r-ay/Arbitrum-QA-Dashboard/main")
+GITHUB_API_URL = os.environ.get("AGDM_GITHUB_API_URL", "https://api.github.com/repos/G-r-ay/Arbitrum-QA-Dashboard")
+GITHUB_BRANCH = os.environ.get("AGDM_GITHUB_BRANCH", "main")
+
+# ----------------------------------------------------------------------
+# Where repository artifacts are read and written (utils/storage.py):
+# "github" goes through RAW_URL and the contents API, "local" uses the
+# checkout in STORAGE_DIR directly
+# ----------------------------------------------------------------------
+STORAGE_BACKEND = os.environ.get("AGDM_STORAGE", "github")
+STORAGE_DIR = os.environ.get("AGDM_STORAGE_DIR", os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# ----------------------------------------------------------------------
+# Local working state (checkpoints, job queue, indexes) never committed
+# ----------------------------------------------------------------------
+CACHE_DIR = os.environ.get(
+    "AGDM_CACHE_DIR", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache")
+)
+
+# ----------------------------------------------------------------------
+# Resource limits
+# ----------------------------------------------------------------------
+SIMILARITY_MEMORY_MB = int(os.environ.get("AGDM_SIMILARITY_MEMORY_MB", 512))
+SIMILARITY_WORKERS = int(os.environ.get("AGDM_SIMILARITY_WORKERS", os.cpu_count() or 1))
+ROUND_CACHE_MB = int(os.environ.get("AGDM_ROUND_CACHE_MB", 1024))  # per-round dashboard results kept in memory
@@ -0,0 +1,216 @@
+# ----------------------------------------------------------------------
+# Imports
+# ----------------------------------------------------------------------
+import time
+import datetime
+import numpy as np
+import pandas as pd
+from utils.address import to_keys
+
+# ----------------------------------------------------------------------
+# Constants
+# ----------------------------------------------------------------------
+FEATURE_COLUMNS = [
+    "voter",
+    "txn_count",
+    "Wallet_Age",
+    "Wallet_Age(Erc20)",
+    "to_count",
+    "from_count",
+    "erc_to",
+    "erc_from",
+    "in-out_ratio",
+    "in-out_ratio_erc",
+    "first_date",
+    "last_date",
+    "first_from",
+    "first_to",
+    "last_from",
+    "last_to",
+    "first_out_amount",
+    "last_out_amount",
+    "first_in_amount",
+    "last_in_amount",
+]
+
+# Bookkeeping stored next to the features so refreshes only ask for new blocks
+SYNC_COLUMNS = [
+    "last_block",
+    "last_block_erc",
+    "first_date_erc",
+    "synced_at",
+    "features_version",
+]
+FEATURES_VERSION = 2  # rows stored by an older extract_features are fetched in full once
+
+TX_FIELDS = ["blockNumber", "timeStamp", "from", "to", "value"]
+WEI = 10**18
+
+# ----------------------------------------------------------------------
+# Function to flatten many raw histories into one columnar table
+# ----------------------------------------------------------------------
+def to_columns(histories):
+    """
+        histories is a list of raw Arbiscan result lists, one per wallet, each
+        already sorted by block. Returns the concatenated transactions and the
+        [start, end) offsets of every wallet inside them.
+    """
+    lengths = np.fromiter((len(history) for history in histories), dtype=np.int64, count=len(histories))
+    ends = np.cumsum(lengths)
+    starts = ends - lengths
+    records = [transaction for history in histories for transaction in history]
+    table = pd.DataFrame.from_records(records, columns=TX_FIELDS) if records else pd.DataFrame(columns=TX_FIELDS)
+    owner = np.repeat(np.arange(len(histories)), lengths)
+    return table, owner, starts, ends
+
+
+def _first_last(mask, owner, n):
+    """Row positions of the first and last masked transaction of every wallet (-1 if none)."""
+    positions = np.flatnonzero(mask)
+    owners = owner[positions]
+    wallets = np.arange(n)
+    left = np.searchsorted(owners, wallets, side="left")
+    right = np.searchsorted(owners, wallets, side="right")
+    has = right > left
+    first = np.full(n, -1)
+    last = np.full(n, -1)
+    first[has] = positions[left[has]]
+    last[has] = positions[right[has] - 1]
+    return first, last
+
+
+def _take(column, positions, fill=None):
+    values = np.asarray(column, dtype=object)
+    out = np.full(len(positions), fill, dtype=object)
+    has = positions >= 0
+    out[has] = values[positions[has]]
+    return out
+
+
+def _ages(timestamps):
+    """Days between each unix timestamp's date and today, 0 where there is none."""
+    timestamps = pd.to_numeric(pd.Series(timestamps), errors="coerce")
+    dates = pd.to_datetime(timestamps, unit="s").dt.normalize()
+    ages = (pd.Timestamp(datetime.date.today()) - dates).dt.days
+    return ages.fillna(0).astype("int64").to_numpy()
+
+
+def _ratio(to_count, from_count):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = np.round(to_count / from_count, 3)
+    return np.where(from_count != 0, ratio, 0.000)
+
+# ----------------------------------------------------------------------
+# Function to compute the get_user_data schema for a batch of wallets
+# ----------------------------------------------------------------------
+def extract_features(addresses, reg_histories, erc20_histories):
+    """
+        Computes every FEATURE_COLUMNS and SYNC_COLUMNS value for a batch of
+        wallets in one vectorized pass over their concatenated histories.
+        Wallets without regular transactions get empty first/last fields.
+    """
+    n = len(addresses)
+    address = np.asarray(addresses, dtype=object)
+    address_keys, address_valid = to_keys(address, return_valid=True)
+
+    reg, reg_owner, reg_starts, reg_ends = to_columns(reg_histories)
+    erc, erc_owner, erc_starts, erc_ends = to_columns(erc20_histories)
+    reg_has = reg_ends > reg_starts
+    erc_has = erc_ends > erc_starts
+
+    # Directional masks on address keys, so the indexer's checksummed
+    # spelling matches Arbiscan's lower-case one
+    owner_keys, owner_valid = address_keys[reg_owner], address_valid[reg_owner]
+    sender_keys, sender_valid = to_keys(reg["from"], return_valid=True)
+    recipient_keys, recipient_valid = to_keys(reg["to"], return_valid=True)
+    out_mask = (sender_keys == owner_keys) & sender_valid & owner_valid
+    in_mask = (recipient_keys == owner_keys) & recipient_valid & owner_valid
+    erc_sender_keys, erc_sender_valid = to_keys(erc["from"], return_valid=True)
+    erc_from_mask = (erc_sender_keys == address_keys[erc_owner]) & erc_sender_valid & address_valid[erc_owner]
+
+    txn_count = reg_ends - reg_starts
+    reg_from = np.bincount(reg_owner, weights=out_mask, minlength=n).astype(np.int64)
+    erc_from = np.bincount(erc_owner, weights=erc_from_mask, minlength=n).astype(np.int64)
+    reg_to = txn_count - reg_from
+    erc_to = (erc_ends - erc_starts) - erc_from
+
+    values = reg["value"].to_numpy(dtype=np.float64) / WEI if len(reg) else np.empty(0)
+    first_out, last_out = _first_last(out_mask, reg_owner, n)
+    first_in, last_in = _first_last(in_mask, reg_owner, n)
+
+    first_row = np.where(reg_has, reg_starts, -1)
+    last_row = np.where(reg_has, reg_ends - 1, -1)
+
+    def endpoint(field, rows):
+        column = _take(reg[field], rows)
+        keys, valid = to_keys(column, return_valid=True)
+        return np.where((keys == address_keys) & valid & address_valid, "self", column)
+
+    first_date_erc = _take(erc["timeStamp"], np.where(erc_has, erc_starts, -1), fill=0)
+    features = pd.DataFrame({
+        "voter": address,
+        "txn_count": txn_count,
+        "Wallet_Age": _ages(_take(reg["timeStamp"], first_row)),
+        "Wallet_Age(Erc20)": _ages(_take(erc["timeStamp"], np.where(erc_has, erc_starts, -1))),
+        "to_count": reg_to,
+        "from_count": reg_from,
+        "erc_to": erc_to,
+        "erc_from": erc_from,
+        "in-out_ratio": _ratio(reg_to, reg_from),
+        "in-out_ratio_erc": _ratio(erc_to, erc_from),
+        "first_date": _take(reg["timeStamp"], first_row),
+        "last_date": _take(reg["timeStamp"], last_row),
+        "first_from": endpoint("from", first_row),
+        "first_to": endpoint("to", first_row),
+        "last_from": endpoint("from", last_row),
+        "last_to": endpoint("to", last_row),
+        "first_out_amount": _take(values, first_out, fill=np.nan).astype(np.float64),
+        "last_out_amount": _take(values, last_out, fill=np.nan).astype(np.float64),
+        "first_in_amount": _take(values, first_in, fill=np.nan).astype(np.float64),
+        "last_in_amount": _take(values, last_in, fill=np.nan).astype(np.float64),
+        "last_block": _take(reg["blockNumber"], last_row, fill=0).astype(np.int64),
+        "last_block_erc": _take(erc["blockNumber"], np.where(erc_has, erc_ends - 1, -1), fill=0).astype(np.int64),
+        "first_date_erc": first_date_erc.astype(np.int64),
+        "synced_at": int(time.time()),
+        "features_version": FEATURES_VERSION,
+    })
+    return features
+
+# ----------------------------------------------------------------------
+# Function to fold delta features into stored rows
+# ----------------------------------------------------------------------
+def fold_features(stored, delta):
+    """
+        stored holds rows previously written by get_user_data and delta the
+        extract_features output for the blocks after each row's cursor, in
+        the same order. Returns the refreshed rows without touching the full
+        histories again.
+    """
+    stored = stored[FEATURE_COLUMNS + SYNC_COLUMNS].reset_index(drop=True)
+    delta = delta.reset_index(drop=True)
+    has_reg = delta["txn_count"].to_numpy() > 0
+    has_erc = delta["last_block_erc"].to_numpy() > 0
+
+    folded = stored.copy()
+    for col in ["txn_count", "to_count", "from_count", "erc_to", "erc_from"]:
+        folded[col] = stored[col].astype(np.int64) + delta[col].astype(np.int64)
+    folded["in-out_ratio"] = _ratio(folded["to_count"].to_numpy(), folded["from_count"].to_numpy())
+    folded["in-out_ratio_erc"] = _ratio(folded["erc_to"].to_numpy(), folded["erc_from"].to_numpy())
+
+    stored_erc_date = stored["first_date_erc"].astype(np.int64)
+    folded["first_date_erc"] = np.where(stored_erc_date > 0, stored_erc_date, delta["first_date_erc"])
+    folded["Wallet_Age"] = _ages(stored["first_date"])
+    folded["Wallet_Age(Erc20)"] = _ages(folded["first_date_erc"].where(folded["first_date_erc"] > 0))
+
+    for col in ["last_date", "last_from", "last_to", "last_block"]:
+        folded[col] = stored[col].where(~has_reg, delta[col])
+    folded["last_block_erc"] = stored["last_block_erc"].where(~has_erc, delta["last_block_erc"])
+
+    for direction in ["out", "in"]:
+        first, last = f"first_{direction}_amount", f"last_{direction}_amount"
+        folded[first] = stored[first].where(stored[first].notna(), delta[first])
+        folded[last] = delta[last].where(delta[last].notna(), stored[last])
+
+    folded["synced_at"] = delta["synced_at"]
+    folded["features_version"] = delta["features_version"]
+    return folded
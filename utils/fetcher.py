@@ -1,24 +1,76 @@
-import streamlit as st
-from Defense_systems.marker import classify
-from datetime import datetime, date, timedelta
-from utils.data_manager import get_data,get_round_status,create_temp_directory_for_rounds,block_timestamp
-
-from utils.queryFunctions import get_user_data
-@st.cache_data
-def fetch():
-    voting_data, project_info, round_data = get_data(st.session_state['round_id'])
-    round_status,start_time,end_time = get_round_status()
-    create_temp_directory_for_rounds(st.session_state.round_id,round_status,voting_data,start_time)
-    voting_data = classify(voting_data,round_status)
-    voting_data = voting_data.reset_index(drop=True)
-    current_date = datetime.now().date()  # Convert to datetime.date
-
-    # Calculate the difference between the current date and the specific day
-    time_difference =  end_time - current_date
-    # Check if two or more days have passed
-    if time_difference >= timedelta(days=2):
-        block_timestamp(st.session_state.round_id)
-        get_user_data(st.session_state.round_id)
-    else:
-        print("old round")
-    return voting_data, project_info, round_data,round_status,start_time,end_time
+import streamlit as st
+from Defense_systems.marker import classify
+from datetime import datetime
+from utils import job_queue, write_queue, round_cache
+from utils.data_manager import get_data,get_round_status
+
+def snapshot_id(round_id):
+    """Id of the round's last completed worker job, None before the first one."""
+    completed = job_queue.last_completed(round_id)
+    return completed['id'] if completed is not None else None
+
+
+def fetch(round_id):
+    """
+        Round results from the shared cache, dropped there first if the
+        worker published a newer snapshot since they were computed.
+    """
+    snapshot = snapshot_id(round_id)
+    round_cache.sync(round_id, snapshot)
+    st.session_state.setdefault('snapshot_ids', {})[round_id] = snapshot
+    return _fetch(round_id)
+
+
+@round_cache.round_cached
+def _fetch(round_id):
+    voting_data, project_info, round_data = get_data(round_id)
+    round_status,start_time,end_time = get_round_status(round_id)
+    voting_data = classify(voting_data,round_status,round_id)
+    voting_data = voting_data.reset_index(drop=True)
+    return voting_data, project_info, round_data,round_status,start_time,end_time
+
+# ----------------------------------------------------------------------
+# Background refresh status
+# ----------------------------------------------------------------------
+@st.fragment(run_every=5)
+def refresh_status(round_id, round_status):
+    """
+        Clustering, recycling scans and enrichment run in worker.py; pages
+        render from the last published snapshot and this shows how fresh it
+        is and how far the running job has got.
+    """
+    if round_status == 'Active':
+        job_queue.enqueue(round_id)
+        job_queue.ensure_worker()
+
+    completed = job_queue.last_completed(round_id)
+    job = job_queue.latest(round_id)
+    if completed is not None:
+        finished = datetime.fromtimestamp(completed['finished_at'])
+        minutes = int((datetime.now() - finished).total_seconds() // 60)
+        st.caption(f"Snapshot refreshed {finished:%Y-%m-%d %H:%M} ({minutes} min ago)")
+    elif round_status == 'Active':
+        st.caption("Showing published data, the first background refresh is still running")
+
+    if job is not None and job['status'] in ('queued', 'running'):
+        st.progress(job['progress'], text=f"Refreshing: {job['stage'] or 'waiting for worker'}")
+    elif job is not None and job['status'] == 'failed':
+        reason = (job['message'] or 'unknown error').strip().splitlines()[-1]
+        st.caption(f"Last refresh failed: {reason}")
+
+    # Repository writes are committed by the worker, submits return at once
+    writes = write_queue.status()
+    if writes['pending']:
+        job_queue.ensure_worker()
+        if writes['error']:
+            st.caption(f"{writes['pending']} file(s) waiting to be saved, retrying after: {writes['error']}")
+        else:
+            st.caption(f"Saving {writes['pending']} file(s) to the repository…")
+    elif writes['last_flushed'] is not None:
+        st.caption(f"All changes saved ({datetime.fromtimestamp(writes['last_flushed']):%Y-%m-%d %H:%M})")
+
+    # A newer snapshot of this round landed since this session rendered it;
+    # the rerun's fetch() drops the round's cached results once per process
+    snapshot = completed['id'] if completed is not None else None
+    if st.session_state.get('snapshot_ids', {}).get(round_id, snapshot) != snapshot:
+        st.rerun(scope="app")
@@ -0,0 +1,146 @@
+# ----------------------------------------------------------------------
+# Imports
+# ----------------------------------------------------------------------
+import io
+import os
+import json
+import hashlib
+import threading
+import requests
+import pandas as pd
+from collections import defaultdict
+from urllib.parse import urlparse
+from requests.adapters import HTTPAdapter
+from utils.config import CACHE_DIR
+
+# ----------------------------------------------------------------------
+# Constants
+# ----------------------------------------------------------------------
+HTTP_CACHE_DIR = os.path.join(CACHE_DIR, "http")
+TIMEOUT = (10, 120)  # seconds to connect, seconds between bytes received
+POOL_SIZE = 16  # kept-alive connections per host, above the Arbiscan worker count
+
+# ----------------------------------------------------------------------
+# One pooled session per host, shared by every thread of the process
+# ----------------------------------------------------------------------
+_sessions = {}
+_stats = defaultdict(lambda: {"requests": 0, "bytes": 0, "not_modified": 0, "errors": 0})
+_lock = threading.Lock()
+
+
+def session(url):
+    host = urlparse(url).netloc
+    with _lock:
+        if host not in _sessions:
+            pooled = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE)
+            pooled.mount("http://", adapter)
+            pooled.mount("https://", adapter)
+            _sessions[host] = pooled
+        return _sessions[host]
+
+
+def _record(url, response=None):
+    with _lock:
+        host = _stats[urlparse(url).netloc]
+        host["requests"] += 1
+        if response is None or response.status_code >= 500:
+            host["errors"] += 1
+        elif response.status_code == 304:
+            host["not_modified"] += 1
+        else:
+            host["bytes"] += len(response.content)
+
+
+def request(method, url, **kwargs):
+    """requests.request on the host's pooled session, with TIMEOUT unless one is given."""
+    kwargs.setdefault("timeout", TIMEOUT)
+    try:
+        response = session(url).request(method, url, **kwargs)
+    except requests.RequestException:
+        _record(url)
+        raise
+    _record(url, response)
+    return response
+
+# ----------------------------------------------------------------------
+# Conditional GETs against an on-disk cache
+# ----------------------------------------------------------------------
+def _cache_files(url, params):
+    key = hashlib.sha1(json.dumps([url, sorted((params or {}).items())], default=str).encode()).hexdigest()
+    base = os.path.join(HTTP_CACHE_DIR, key)
+    return base + ".body", base + ".json"
+
+
+def _load_cached(meta_path, body_path):
+    try:
+        with open(meta_path) as f:
+            meta = json.load(f)
+        with open(body_path, "rb") as f:
+            return meta, f.read()
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None, None
+
+
+def _store(body_path, meta_path, meta, content):
+    os.makedirs(HTTP_CACHE_DIR, exist_ok=True)
+    # Body first, so a meta file never points at a partial body
+    for path, data in ((body_path, content), (meta_path, json.dumps(meta).encode())):
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+
+def get(url, params=None, headers=None, cache=False, **kwargs):
+    """
+        GET on the pooled session. With cache the last 200 is kept on disk
+        with its ETag/Last-Modified and revalidated, so an unchanged
+        artifact costs a 304 and no body; the response then carries the
+        cached content with status 200 and from_cache set.
+    """
+    if not cache:
+        return request("GET", url, params=params, headers=headers, **kwargs)
+
+    body_path, meta_path = _cache_files(url, params)
+    meta, content = _load_cached(meta_path, body_path)
+    headers = dict(headers or {})
+    if meta is not None:
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+    response = request("GET", url, params=params, headers=headers, **kwargs)
+    response.from_cache = False
+    if response.status_code == 304 and meta is not None:
+        response.status_code = 200
+        response._content = content
+        response.from_cache = True
+    elif response.status_code == 200 and (response.headers.get("ETag") or response.headers.get("Last-Modified")):
+        meta = {"url": url, "etag": response.headers.get("ETag"), "last_modified": response.headers.get("Last-Modified")}
+        _store(body_path, meta_path, meta, response.content)
+    return response
+
+
+def read_json(url):
+    """pd.read_json of a JSON document at url, revalidated against the disk cache."""
+    response = get(url, cache=True)
+    response.raise_for_status()
+    return pd.read_json(io.BytesIO(response.content))
+
+# ----------------------------------------------------------------------
+# Per-host counters for this process
+# ----------------------------------------------------------------------
+def stats():
+    """{host: {requests, bytes, not_modified, errors}} since the process started."""
+    with _lock:
+        return {host: dict(counts) for host, counts in _stats.items()}
+
+
+def print_stats():
+    for host, counts in sorted(stats().items()):
+        print(
+            f"{host}: {counts['requests']} requests, {counts['bytes'] / 1e6:.2f} MB, "
+            f"{counts['not_modified']} not modified, {counts['errors']} errors"
+        )
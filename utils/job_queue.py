@@ -0,0 +1,207 @@
+# ----------------------------------------------------------------------
+# Imports
+# ----------------------------------------------------------------------
+import os
+import sys
+import time
+import sqlite3
+import subprocess
+from utils.config import CACHE_DIR
+
+# ----------------------------------------------------------------------
+# Constants
+# ----------------------------------------------------------------------
+QUEUE_PATH = os.path.join(CACHE_DIR, "jobs.sqlite")
+HEARTBEAT_PATH = os.path.join(CACHE_DIR, "worker.heartbeat")
+LOG_PATH = os.path.join(CACHE_DIR, "worker.log")
+LOG_MAX_BYTES = 10 * 2**20  # rotated to worker.log.1 when a worker starts past this size
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "worker.py")
+HEARTBEAT_TIMEOUT = 60  # seconds without a heartbeat before the worker is considered dead
+STALE_AFTER = 15 * 60  # seconds before a finished round is refreshed again
+
+# ----------------------------------------------------------------------
+# Connection and schema
+# ----------------------------------------------------------------------
+def connect():
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    connection = sqlite3.connect(QUEUE_PATH, timeout=30, isolation_level=None)
+    connection.row_factory = sqlite3.Row
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute(
+        """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            round_id TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'queued',
+            stage TEXT,
+            progress INTEGER NOT NULL DEFAULT 0,
+            message TEXT,
+            created_at REAL NOT NULL,
+            started_at REAL,
+            finished_at REAL
+        )
+        """
+    )
+    return connection
+
+# ----------------------------------------------------------------------
+# Producer side (dashboard)
+# ----------------------------------------------------------------------
+def enqueue(round_id):
+    """
+        Queues a refresh of round_id unless one is already queued or running,
+        or the last one finished less than STALE_AFTER seconds ago.
+        Returns the id of the job covering the round.
+    """
+    connection = connect()
+    try:
+        connection.execute("BEGIN IMMEDIATE")
+        row = connection.execute(
+            """
+            SELECT id FROM jobs WHERE round_id = ?
+            AND (status IN ('queued', 'running') OR (status = 'done' AND finished_at >= ?))
+            ORDER BY id DESC LIMIT 1
+            """,
+            (round_id, time.time() - STALE_AFTER),
+        ).fetchone()
+        if row is None:
+            job_id = connection.execute(
+                "INSERT INTO jobs (round_id, created_at) VALUES (?, ?)", (round_id, time.time())
+            ).lastrowid
+        else:
+            job_id = row["id"]
+        connection.execute("COMMIT")
+        return job_id
+    finally:
+        connection.close()
+
+
+def latest(round_id):
+    """Most recent job of the round as a dict, or None."""
+    connection = connect()
+    try:
+        row = connection.execute(
+            "SELECT * FROM jobs WHERE round_id = ? ORDER BY id DESC LIMIT 1", (round_id,)
+        ).fetchone()
+        return dict(row) if row else None
+    finally:
+        connection.close()
+
+
+def last_completed(round_id):
+    connection = connect()
+    try:
+        row = connection.execute(
+            "SELECT * FROM jobs WHERE round_id = ? AND status = 'done' ORDER BY finished_at DESC LIMIT 1",
+            (round_id,),
+        ).fetchone()
+        return dict(row) if row else None
+    finally:
+        connection.close()
+
+
+def worker_alive():
+    return os.path.exists(HEARTBEAT_PATH) and time.time() - os.path.getmtime(HEARTBEAT_PATH) < HEARTBEAT_TIMEOUT
+
+
+def ensure_worker():
+    """Starts worker.py in its own session when no live worker is heartbeating."""
+    if worker_alive():
+        return
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    # Touch first so concurrent sessions don't each spawn a worker
+    with open(HEARTBEAT_PATH, "a"):
+        os.utime(HEARTBEAT_PATH, None)
+    if os.path.exists(LOG_PATH) and os.path.getsize(LOG_PATH) > LOG_MAX_BYTES:
+        os.replace(LOG_PATH, LOG_PATH + ".1")
+    # Unbuffered so tracebacks from the worker land in the log as they happen
+    with open(LOG_PATH, "ab") as log:
+        subprocess.Popen(
+            [sys.executable, "-u", WORKER_SCRIPT],
+            cwd=os.path.dirname(WORKER_SCRIPT),
+            start_new_session=True,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+        )
+
+# ----------------------------------------------------------------------
+# Consumer side (worker.py)
+# ----------------------------------------------------------------------
+def heartbeat():
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with open(HEARTBEAT_PATH, "a"):
+        os.utime(HEARTBEAT_PATH, None)
+
+
+def claim():
+    """Marks the oldest queued job as running and returns it, or None."""
+    connection = connect()
+    try:
+        connection.execute("BEGIN IMMEDIATE")
+        row = connection.execute("SELECT * FROM jobs WHERE status = 'queued' ORDER BY id LIMIT 1").fetchone()
+        if row is not None:
+            connection.execute(
+                "UPDATE jobs SET status = 'running', started_at = ? WHERE id = ?", (time.time(), row["id"])
+            )
+        connection.execute("COMMIT")
+        return dict(row) if row else None
+    finally:
+        connection.close()
+
+
+def requeue_orphans():
+    """Jobs left running by a worker that died go back to the queue."""
+    connection = connect()
+    try:
+        connection.execute("UPDATE jobs SET status = 'queued', progress = 0 WHERE status = 'running'")
+    finally:
+        connection.close()
+
+
+def update(job_id, stage=None, progress=None, message=None):
+    connection = connect()
+    try:
+        connection.execute(
+            """
+            UPDATE jobs SET stage = COALESCE(?, stage), progress = COALESCE(?, progress),
+            message = COALESCE(?, message) WHERE id = ?
+            """,
+            (stage, progress, message, job_id),
+        )
+    finally:
+        connection.close()
+
+
+def finish(job_id, status="done", message=None):
+    connection = connect()
+    try:
+        connection.execute(
+            "UPDATE jobs SET status = ?, progress = 100, message = ?, finished_at = ? WHERE id = ?",
+            (status, message, time.time(), job_id),
+        )
+    finally:
+        connection.close()
+
+
+class JobProgress:
+    """Stands in for st.progress so pipeline stages report into the queue."""
+
+    def __init__(self, job_id, stage):
+        self.job_id = job_id
+        self.stage = stage
+        self.value = 0
+        update(job_id, stage=stage, progress=0)
+
+    def progress(self, value, text=None):
+        # Only whole-percent changes hit the database
+        if int(value) != self.value:
+            self.value = int(value)
+            update(self.job_id, stage=text or self.stage, progress=self.value)
+
+    def empty(self):
+        pass
+
+
+def progress_bar(job_id):
+    """Factory with the st.progress signature bound to a job."""
+    return lambda value=0, text=None: JobProgress(job_id, text)
@@ -0,0 +1,118 @@
+# ----------------------------------------------------------------------
+# Imports
+# ----------------------------------------------------------------------
+import os
+import time
+import pandas as pd
+from utils.address import canonical
+from utils.storage import storage
+
+# ----------------------------------------------------------------------
+# Constants
+# ----------------------------------------------------------------------
+DB_DIR = "main_db"
+LEGACY_FILE = "main_db.parquet"  # the single-file database, read as the base until the first compaction
+COLUMNS = ["address", "Threat Type"]
+COMPACT_AFTER = 8  # delta segments waiting before they are merged into a new base
+
+# ----------------------------------------------------------------------
+# main_db as immutable segments: one sorted base plus the deltas since
+# ----------------------------------------------------------------------
+#   main_db/base-<stamp>.parquet   every entry up to and including delta <stamp>
+#   main_db/delta-<stamp>.parquet  the entries of one review submit
+#
+# Stamps are zero-padded nanosecond times so names sort chronologically.
+# Files are never rewritten: a compaction writes a new base first and only
+# then deletes what it merged, and readers ignore deltas a base already
+# covers, so an interrupted compaction leaves a consistent view.
+
+def _stamp(path):
+    return os.path.basename(path).split("-", 1)[1].rsplit(".", 1)[0]
+
+
+def list_segments():
+    """
+        Paths of the segments making up main_db, oldest first: the newest
+        base (the legacy main_db.parquet before the first compaction)
+        followed by the deltas written after it.
+    """
+    files = storage.list(DB_DIR)
+    bases = [path for path in files if os.path.basename(path).startswith("base-")]
+    deltas = [path for path in files if os.path.basename(path).startswith("delta-")]
+    if not bases:
+        return [LEGACY_FILE] + deltas
+    covered = _stamp(bases[-1])
+    return [bases[-1]] + [path for path in deltas if _stamp(path) > covered]
+
+
+def read_segment(path):
+    frame = storage.read_parquet(path)
+    if frame is None:
+        if path != LEGACY_FILE:
+            raise FileNotFoundError(path)
+        # No database at all yet
+        frame = pd.DataFrame(columns=COLUMNS)
+    return frame
+
+
+def read_db(segments=None):
+    """
+        Merged view with the columns main_db.parquet always had. Entries of
+        the newest delta are 'New' and everything older is 'Old', which is
+        what rewriting the whole file on every submit used to produce.
+    """
+    segments = list_segments() if segments is None else list(segments)
+    frames = [read_segment(path) for path in segments]
+    base, deltas = frames[0], frames[1:]
+    if deltas or "entry_status" not in base:
+        base = base.assign(entry_status="Old")
+    if deltas:
+        deltas = [delta.assign(entry_status="Old") for delta in deltas[:-1]] + [deltas[-1].assign(entry_status="New")]
+    db = pd.concat([base] + deltas, ignore_index=True)
+    return db[COLUMNS + ["entry_status"]].drop_duplicates(ignore_index=True)
+
+
+def append_entries(entries):
+    """
+        Writes the entries of one submit as a new delta segment; the cost is
+        the size of the entries, not of the database. Returns its path.
+    """
+    entries = entries.rename(columns={"voter": "address"}) if "address" not in entries else entries
+    entries = entries[COLUMNS].dropna().drop_duplicates(ignore_index=True)
+    entries["address"] = canonical(entries["address"])
+    path = f"{DB_DIR}/delta-{time.time_ns():020d}.parquet"
+    if storage.write_parquet(path, entries, f"Add {path}"):
+        print(f"{len(entries)} entries appended to main_db.")
+    return path
+
+# ----------------------------------------------------------------------
+# Compaction (run by worker.py)
+# ----------------------------------------------------------------------
+def compact(segments=None, compact_after=COMPACT_AFTER):
+    """
+        Merges the base and every delta but the newest (which still holds
+        the 'New' entries) into a sorted, deduplicated base, then deletes the
+        merged files. Returns True when a compaction ran.
+    """
+    paths = list_segments() if segments is None else list(segments)
+    merged = paths[:-1]
+    if len(paths) - 1 < compact_after:
+        return False
+    deltas = [path for path in merged if os.path.basename(path).startswith("delta-")]
+    if not deltas and merged[0] != LEGACY_FILE:
+        # Only the current base itself, nothing to merge
+        return False
+
+    frames = [read_segment(path)[COLUMNS] for path in merged]
+    base = pd.concat(frames, ignore_index=True).drop_duplicates(ignore_index=True)
+    # Stable so an address keeps its entries in the order they were added
+    base = base.sort_values("address", kind="stable", ignore_index=True)
+    # The base covers the newest merged delta; the legacy file alone covers none
+    path = f"{DB_DIR}/base-{_stamp(deltas[-1]) if deltas else '0' * 20}.parquet"
+    if not storage.write_parquet(path, base, f"Compact main_db into {path}"):
+        return False
+    print(f"main_db compacted: {len(merged)} segments into {path} ({len(base)} entries)")
+
+    for old in merged:
+        storage.delete(old)
+    return True
@@ -0,0 +1,161 @@
+# ----------------------------------------------------------------------
+# Imports
+# ----------------------------------------------------------------------
+import sys
+import time
+import pickle
+import threading
+import functools
+import numpy as np
+import pandas as pd
+from collections import OrderedDict
+from utils.config import ROUND_CACHE_MB
+
+# ----------------------------------------------------------------------
+# Per-round results shared by every session of the process
+# ----------------------------------------------------------------------
+# Streamlit runs each session as a thread of one server process, so one
+# LRU here serves them all: switching rounds in one session no longer
+# drops what another session is looking at, and a recently viewed round
+# comes back without downloading or classifying it again. Entries are
+# keyed by (function, round_id, other args) and evicted least recently
+# used first once their estimated size passes ROUND_CACHE_MB.
+
+def size_of(value):
+    """Estimated bytes held by value."""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return int(np.sum(value.memory_usage(deep=True)))
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (tuple, list)):
+        return sys.getsizeof(value) + sum(size_of(item) for item in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(size_of(key) + size_of(item) for key, item in value.items())
+    if isinstance(value, (str, bytes, int, float, bool, type(None))):
+        return sys.getsizeof(value)
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return sys.getsizeof(value)
+
+
+def _copy(value):
+    """Callers get their own frames and arrays, as st.cache_data gives them, so mutating one can't touch the cache."""
+    if isinstance(value, (pd.DataFrame, pd.Series, np.ndarray)):
+        return value.copy()
+    if isinstance(value, tuple):
+        return tuple(_copy(item) for item in value)
+    if isinstance(value, list):
+        return [_copy(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _copy(item) for key, item in value.items()}
+    return value
+
+
+class RoundCache:
+    def __init__(self, max_bytes=ROUND_CACHE_MB * 2**20):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # key -> (value, size, expires)
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.RLock()
+        self.loading = {}  # key -> lock, so concurrent sessions compute a round once
+        self.snapshots = {}  # round_id -> last published snapshot its entries were computed from
+
+    def get(self, key, count=True):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or (entry[2] is not None and entry[2] < time.time()):
+                if entry is not None:
+                    self._drop(key)
+                self.misses += count
+                return False, None
+            self.entries.move_to_end(key)
+            self.hits += count
+            return True, entry[0]
+
+    def put(self, key, value, ttl=None):
+        size = size_of(value)
+        with self.lock:
+            if key in self.entries:
+                self._drop(key)
+            # Too big to ever fit: served once, not kept
+            if size > self.max_bytes:
+                return
+            self.entries[key] = (value, size, None if ttl is None else time.time() + ttl)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                self._drop(next(iter(self.entries)))
+
+    def _drop(self, key):
+        _, size, _ = self.entries.pop(key)
+        self.bytes -= size
+
+    def clear(self, round_id=None, name=None):
+        """Drops the entries of one round and/or one function, everything by default."""
+        with self.lock:
+            for key in [key for key in self.entries if round_id in (None, key[1]) and name in (None, key[0])]:
+                self._drop(key)
+
+    def sync(self, round_id, snapshot):
+        """
+            Drops the round's entries once when a newer snapshot of it is
+            published, whichever session sees it first. True if it did.
+        """
+        with self.lock:
+            changed = round_id in self.snapshots and self.snapshots[round_id] != snapshot
+            if changed:
+                self.clear(round_id)
+            self.snapshots[round_id] = snapshot
+            return changed
+
+    def stats(self):
+        with self.lock:
+            return {"entries": len(self.entries), "mb": self.bytes / 2**20, "hits": self.hits, "misses": self.misses}
+
+    def load(self, key, compute, ttl=None):
+        found, value = self.get(key)
+        if found:
+            return value
+        with self.lock:
+            loading = self.loading.setdefault(key, threading.Lock())
+        with loading:
+            # Another session may have computed it while this one waited
+            found, value = self.get(key, count=False)
+            if not found:
+                value = compute()
+                self.put(key, value, ttl)
+        with self.lock:
+            self.loading.pop(key, None)
+        return value
+
+
+cache = RoundCache()
+
+
+def round_cached(func=None, ttl=None):
+    """
+        Caches func(round_id, *args) in the shared round cache. The first
+        argument must be the round id, the rest must be hashable.
+    """
+    if func is None:
+        return functools.partial(round_cached, ttl=ttl)
+
+    @functools.wraps(func)
+    def wrapper(round_id, *args, **kwargs):
+        key = (func.__qualname__, round_id, args, tuple(sorted(kwargs.items())))
+        return _copy(cache.load(key, lambda: func(round_id, *args, **kwargs), ttl))
+
+    wrapper.clear = lambda round_id=None: cache.clear(round_id, func.__qualname__)
+    return wrapper
+
+
+def sync(round_id, snapshot):
+    """Keeps round_id's cached results in step with its published snapshot."""
+    return cache.sync(round_id, snapshot)
+
+
+def clear(round_id=None):
+    """Drops every cached result of round_id, e.g. after a new snapshot or a review submit."""
+    cache.clear(round_id)
@@ -0,0 +1,278 @@
+# ----------------------------------------------------------------------
+# Imports
+# ----------------------------------------------------------------------
+import io
+import os
+import json
+import time
+import base64
+import streamlit as st
+from utils import http, write_queue
+from utils.address import read_parquet, to_parquet
+from utils.config import RAW_URL, GITHUB_API_URL, GITHUB_BRANCH, STORAGE_BACKEND, STORAGE_DIR
+
+# ----------------------------------------------------------------------
+# Constants
+# ----------------------------------------------------------------------
+COMMIT_ATTEMPTS = 3  # tries at moving the branch when another commit lands first
+
+# ----------------------------------------------------------------------
+# Repository artifacts (round_user_info, time_mappings, review_db,
+# main_db, indexes) behind one interface. Paths are relative to the
+# repository root, e.g. "review_db/<round>/cosine_clusters.json".
+# ----------------------------------------------------------------------
+class Storage:
+    """
+        Writes and deletes are staged in utils/write_queue.py and return at
+        once; flush() (run by worker.py) commits everything pending as one
+        atomic change. Reads see staged content before it is committed.
+        Backends implement _read, _list and commit.
+    """
+
+    def _read(self, path):
+        """Committed bytes of path, None when it doesn't exist."""
+        raise NotImplementedError
+
+    def _list(self, directory):
+        """Committed paths directly under directory, empty when it doesn't exist."""
+        raise NotImplementedError
+
+    def _local_path(self, path):
+        return None
+
+    def _exists(self, path):
+        return self._read(path) is not None
+
+    def commit(self, changes, message):
+        """Applies {path: content or None to delete} at once, returns a commit id."""
+        raise NotImplementedError
+
+    def read(self, path):
+        """Bytes of path, None when it doesn't exist."""
+        staged, content = write_queue.pending(path)
+        return content if staged else self._read(path)
+
+    def write(self, path, content, message=None):
+        """Stages content as path's new version, returns True."""
+        write_queue.stage(path, content, message or f"Updated {path}")
+        return True
+
+    def delete(self, path, message=None):
+        if not self.exists(path):
+            return False
+        write_queue.stage(path, None, message or f"Delete {path}")
+        return True
+
+    def list(self, directory):
+        """Paths of the files directly under directory, sorted; empty when it doesn't exist."""
+        files = set(self._list(directory))
+        for path, deleted in write_queue.pending_under(directory).items():
+            if deleted:
+                files.discard(path)
+            else:
+                files.add(path)
+        return sorted(files)
+
+    def local_path(self, path):
+        """Filesystem path of path when the backend keeps it on local disk, else None."""
+        staged, _ = write_queue.pending(path)
+        return None if staged else self._local_path(path)
+
+    def exists(self, path):
+        staged, content = write_queue.pending(path)
+        return content is not None if staged else self._exists(path)
+
+    def flush(self):
+        """Commits every due staged write, returns the number of files committed."""
+        writes = write_queue.claim()
+        if not writes:
+            return 0
+        changes = write_queue.coalesce(writes)
+        messages = list(dict.fromkeys(write["message"] for write in writes))
+        message = messages[0] if len(messages) == 1 else f"Update {len(changes)} files\n\n" + "\n".join(messages)
+        try:
+            commit_sha = self.commit(changes, message)
+        except Exception as e:
+            print(f"Commit of {len(changes)} files failed, will retry:", e)
+            write_queue.failed(writes, str(e))
+            return 0
+        write_queue.done(writes, commit_sha)
+        print(f"{len(changes)} files committed ({commit_sha}).")
+        return len(changes)
+
+    def read_json(self, path, default=None):
+        content = self.read(path)
+        if content is None:
+            if default is None:
+                raise FileNotFoundError(path)
+            return default
+        return json.loads(content)
+
+    def write_json(self, path, data, message=None):
+        return self.write(path, json.dumps(data).encode(), message)
+
+    def read_parquet(self, path, **kwargs):
+        """Parquet with address columns decoded, memory-mapped when local; None when missing."""
+        local = self.local_path(path)
+        if local is not None:
+            return read_parquet(local, memory_map=True, **kwargs)
+        content = self.read(path)
+        return None if content is None else read_parquet(io.BytesIO(content), **kwargs)
+
+    def write_parquet(self, path, frame, message=None):
+        return self.write(path, to_parquet(frame), message)
+
+    def write_if_changed(self, path, content, message=None):
+        """Writes content unless path already holds exactly it, so unchanged artifacts add no commits."""
+        if self.read(path) == content:
+            return False
+        return self.write(path, content, message)
+
+    def local_copy(self, path, cache_path, max_age):
+        """
+            Filesystem path holding path's content: the file itself for a
+            local backend, otherwise cache_path, downloaded again once it is
+            older than max_age seconds. None when path doesn't exist.
+        """
+        local = self.local_path(path)
+        if local is not None:
+            return local
+        if not os.path.exists(cache_path) or time.time() - os.path.getmtime(cache_path) > max_age:
+            content = self.read(path)
+            if content is not None:
+                _write_atomic(cache_path, content)
+        return cache_path if os.path.exists(cache_path) else None
+
+
+def _write_atomic(file_path, content):
+    os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+    tmp = file_path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(content)
+    os.replace(tmp, file_path)
+
+# ----------------------------------------------------------------------
+# GitHub: reads from raw.githubusercontent, commits through the Git Data API
+# ----------------------------------------------------------------------
+class GitHubStorage(Storage):
+    def __init__(self, raw_url=RAW_URL, api_url=GITHUB_API_URL, branch=GITHUB_BRANCH):
+        self.raw_url = raw_url
+        self.api_url = api_url
+        self.branch = branch
+
+    def _headers(self):
+        return {
+            "Authorization": f"Bearer {st.secrets['ACCESS_TOKEN']}"
+        }
+
+    def _api(self, method, endpoint, payload=None):
+        response = http.request(method, f"{self.api_url}/{endpoint}", json=payload, headers=self._headers())
+        response.raise_for_status()
+        return response.json()
+
+    def _read(self, path):
+        response = http.get(f"{self.raw_url}/{path}", cache=True)
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        return response.content
+
+    def _exists(self, path):
+        response = http.request("HEAD", f"{self.raw_url}/{path}")
+        if response.status_code == 404:
+            return False
+        response.raise_for_status()
+        return True
+
+    def _list(self, directory, ref=None):
+        params = {"ref": ref} if ref else None
+        response = http.get(f"{self.api_url}/contents/{directory}", params=params, headers=self._headers(), cache=True)
+        if response.status_code != 200 or not isinstance(response.json(), list):
+            return []
+        return [file["path"] for file in response.json()]
+
+    def commit(self, changes, message):
+        """
+            One commit for every change: blobs for binary content (text goes
+            inline in the tree), a tree on top of the branch head, a commit,
+            then a fast-forward of the branch. When another commit moved the
+            branch meanwhile, the tree is rebuilt on the new head.
+        """
+        entries = {}
+        for path, content in changes.items():
+            if content is None:
+                continue
+            try:
+                entries[path] = {"content": content.decode("utf-8")}
+            except UnicodeDecodeError:
+                blob = self._api("POST", "git/blobs", {"content": base64.b64encode(content).decode(), "encoding": "base64"})
+                entries[path] = {"sha": blob["sha"]}
+
+        deletes = sorted(path for path, content in changes.items() if content is None)
+        for attempt in range(COMMIT_ATTEMPTS):
+            head = self._api("GET", f"git/ref/heads/{self.branch}")["object"]["sha"]
+            base_tree = self._api("GET", f"git/commits/{head}")["tree"]["sha"]
+            # The tree API rejects deleting a path that isn't there
+            existing = set()
+            for directory in {path.rsplit("/", 1)[0] if "/" in path else "" for path in deletes}:
+                existing.update(self._list(directory, ref=head))
+            tree = [dict(path=path, mode="100644", type="blob", **entry) for path, entry in entries.items()]
+            tree += [dict(path=path, mode="100644", type="blob", sha=None) for path in deletes if path in existing]
+            if not tree:
+                return head
+
+            tree_sha = self._api("POST", "git/trees", {"base_tree": base_tree, "tree": tree})["sha"]
+            commit_sha = self._api("POST", "git/commits", {"message": message, "tree": tree_sha, "parents": [head]})["sha"]
+            response = http.request(
+                "PATCH",
+                f"{self.api_url}/git/refs/heads/{self.branch}",
+                json={"sha": commit_sha, "force": False},
+                headers=self._headers(),
+            )
+            if response.status_code == 200:
+                return commit_sha
+            if response.status_code != 422 or attempt == COMMIT_ATTEMPTS - 1:
+                response.raise_for_status()
+            print(f"{self.branch} moved during the commit, retrying on the new head.")
+
+# ----------------------------------------------------------------------
+# Local directory: a checkout of the repository, no network at all
+# ----------------------------------------------------------------------
+class LocalStorage(Storage):
+    def __init__(self, root=STORAGE_DIR):
+        self.root = root
+
+    def _file(self, path):
+        return os.path.join(self.root, *path.split("/"))
+
+    def _read(self, path):
+        try:
+            with open(self._file(path), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def _list(self, directory):
+        base = self._file(directory)
+        if not os.path.isdir(base):
+            return []
+        return [f"{directory}/{name}" for name in os.listdir(base) if os.path.isfile(os.path.join(base, name))]
+
+    def _local_path(self, path):
+        file_path = self._file(path)
+        return file_path if os.path.exists(file_path) else None
+
+    def _exists(self, path):
+        return os.path.exists(self._file(path))
+
+    def commit(self, changes, message):
+        """Each file is replaced atomically, the set of them is not."""
+        for path, content in changes.items():
+            if content is not None:
+                _write_atomic(self._file(path), content)
+            elif os.path.exists(self._file(path)):
+                os.remove(self._file(path))
+        return "local"
+
+
+storage = LocalStorage() if STORAGE_BACKEND == "local" else GitHubStorage()
@@ -0,0 +1,453 @@
+# ----------------------------------------------------------------------
+# Local stand-in for Arbiscan, the Gitcoin indexer and the GitHub repo
+#
+#   python -m utils.stub_server --port 8765 --latency 0.05 --rate 5
+#
+# then export the AGDM_*_URL variables it prints before starting
+# Streamlit. Responses come from recorded fixtures, from the upstream
+# service when --record is set (and are then saved as fixtures), or from
+# a deterministic synthetic generator.
+# ----------------------------------------------------------------------
+import io
+import os
+import json
+import time
+import base64
+import random
+import hashlib
+import argparse
+import threading
+import requests
+import pandas as pd
+from urllib.parse import urlparse, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from utils.arbiscan import TokenBucket
+from utils.features import FEATURE_COLUMNS, SYNC_COLUMNS
+
+# ----------------------------------------------------------------------
+# Constants
+# ----------------------------------------------------------------------
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+UPSTREAM = {
+    "arbiscan": "https://api.arbiscan.io/api",
+    "indexer": "https://grants-stack-indexer.gitcoin.co",
+    "raw": "https://raw.githubusercontent.com/G-r-ay/Arbitrum-QA-Dashboard/main",
+}
+SYNTHETIC_ROUND = "0x5e1f000000000000000000000000000000000001"
+GENESIS_TIME = 1622240000  # Arbitrum One block 0, blocks are ~0.25s apart
+BLOCK_TIME = 0.25
+RATE_LIMITED = {"status": "0", "message": "NOTOK", "result": "Max rate limit reached"}
+
+
+def block_to_time(block):
+    return int(GENESIS_TIME + int(block) * BLOCK_TIME)
+
+
+def time_to_block(timestamp):
+    return int((int(timestamp) - GENESIS_TIME) / BLOCK_TIME)
+
+
+def address_for(*parts):
+    return "0x" + hashlib.sha1(":".join(map(str, parts)).encode()).hexdigest()[:40]
+
+# ----------------------------------------------------------------------
+# Deterministic synthetic data
+# ----------------------------------------------------------------------
+class Synthetic:
+    def __init__(self, voters=2000, projects=60, votes=20000, seed=0):
+        self.seed = seed
+        rng = random.Random(seed)
+        # Anchored to midnight so the same seed gives the same round all day
+        now = int(time.time()) // 86400 * 86400
+        self.start_time = now - 10 * 86400
+        self.end_time = now + 5 * 86400
+        self.voters = [address_for(seed, "voter", i) for i in range(voters)]
+        self.projects = [address_for(seed, "project", i) for i in range(projects)]
+        self.votes = []
+        start_block, end_block = time_to_block(self.start_time), time_to_block(now)
+        for i in range(votes):
+            project = rng.randrange(projects)
+            amount = round(rng.lognormvariate(0, 1.2), 2)
+            self.votes.append({
+                "id": f"vote-{i}",
+                "transaction": "0x" + hashlib.sha256(f"{seed}:tx:{i}".encode()).hexdigest(),
+                "blockNumber": rng.randint(start_block, end_block),
+                "projectId": self.projects[project],
+                "applicationId": str(project),
+                "roundId": SYNTHETIC_ROUND,
+                "voter": rng.choice(self.voters),
+                "grantAddress": address_for(seed, "grant", project),
+                "token": "0x0000000000000000000000000000000000000000",
+                "amount": str(int(amount * 10**15)),
+                "amountUSD": amount,
+                "amountRoundToken": str(int(amount * 10**15)),
+            })
+
+    def indexer(self, path):
+        if path.endswith("/rounds.json"):
+            return [{
+                "id": SYNTHETIC_ROUND,
+                "uniqueContributors": len({vote["voter"] for vote in self.votes}),
+                "amountUSD": sum(vote["amountUSD"] for vote in self.votes),
+                "matchAmountUSD": 100000,
+                "roundStartTime": self.start_time,
+                "roundEndTime": self.end_time,
+                "metadata": {"name": "Synthetic Round"},
+            }]
+        if path.endswith("/votes.json"):
+            return self.votes
+        if path.endswith("/applications.json"):
+            return [{
+                "id": str(i),
+                "projectId": project,
+                "status": "APPROVED",
+                "metadata": {"application": {"project": {"title": f"Synthetic Project {i}"}}},
+            } for i, project in enumerate(self.projects)]
+        if path.endswith("/contributors.json"):
+            totals = {}
+            for vote in self.votes:
+                totals[vote["voter"]] = totals.get(vote["voter"], 0) + vote["amountUSD"]
+            return [{"id": voter, "amountUSD": amount} for voter, amount in totals.items()]
+        return None
+
+    def history(self, address, action):
+        rng = random.Random(f"{self.seed}:{address}:{action}")
+        size = rng.randint(1, 60) if action == "txlist" else rng.randint(0, 20)
+        block = rng.randint(1_000_000, time_to_block(self.start_time))
+        transactions = []
+        for _ in range(size):
+            block += rng.randint(1, 400_000)
+            outgoing = rng.random() < 0.5
+            counterparty = rng.choice(self.voters) if rng.random() < 0.1 else address_for(self.seed, "wallet", rng.randrange(5000))
+            transactions.append({
+                "blockNumber": str(block),
+                "timeStamp": str(block_to_time(block)),
+                "hash": "0x" + hashlib.sha256(f"{address}:{action}:{block}".encode()).hexdigest(),
+                "from": address if outgoing else counterparty,
+                "to": counterparty if outgoing else address,
+                "value": str(rng.randint(0, 5 * 10**18)),
+            })
+        return transactions
+
+    def raw(self, path):
+        """Empty artifacts for a round that has never been processed."""
+        if path.startswith("round_user_info/") and path.endswith(".parquet"):
+            buffer = io.BytesIO()
+            pd.DataFrame(columns=FEATURE_COLUMNS + SYNC_COLUMNS).to_parquet(buffer, index=False)
+            return buffer.getvalue()
+        if path.startswith(("time_mappings/", "review_db/")) and path.endswith(".json"):
+            return b"{}"
+        return None
+
+# ----------------------------------------------------------------------
+# Fixture store: recorded responses plus a writable overlay of the repo
+# ----------------------------------------------------------------------
+class Fixtures:
+    def __init__(self, root, synthetic=None, record=False):
+        self.root = root
+        self.synthetic = synthetic
+        self.record = record
+        self.deleted = set()
+        self.lock = threading.Lock()
+        # Git Data API: blobs, trees and commits by sha, one branch head
+        self.objects = {}
+        self.head = hashlib.sha1(b"initial").hexdigest()
+        self.objects[self.head] = {"tree": [], "parents": []}
+
+    def _path(self, *parts):
+        return os.path.join(self.root, *parts)
+
+    def _load(self, path):
+        if os.path.isfile(path):
+            with open(path, "rb") as f:
+                return f.read()
+        return None
+
+    def _save(self, path, content):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(content)
+
+    def arbiscan(self, params):
+        module, action = params.get("module"), params.get("action")
+        if module == "block" and action == "getblockreward":
+            block = params["blockno"]
+            return {"blockNumber": str(block), "timeStamp": str(block_to_time(block))} if self.synthetic else self._arbiscan_fixture(params, f"{action}/{block}.json")
+        if module == "block" and action == "getblocknobytime":
+            return str(time_to_block(params["timestamp"])) if self.synthetic else self._arbiscan_fixture(params, f"{action}/{params['timestamp']}.json")
+
+        # Histories are recorded in full and sliced to the requested blocks
+        address = params["address"].lower()
+        history = self._arbiscan_fixture(dict(params, startblock=0, endblock=99999999), f"{action}/{address}.json")
+        if history is None and self.synthetic:
+            history = self.synthetic.history(address, action)
+        if history is None:
+            return None
+        # Like Arbiscan, the customary endblock=99999999 means "latest" even
+        # though Arbitrum block numbers are well past it
+        start, end = int(params.get("startblock", 0)), int(params.get("endblock", 99999999))
+        end = float("inf") if end >= 99999999 else end
+        return [transaction for transaction in history if start <= int(transaction["blockNumber"]) <= end]
+
+    def _arbiscan_fixture(self, params, name):
+        path = self._path("arbiscan", name)
+        content = self._load(path)
+        if content is not None:
+            return json.loads(content)
+        if self.record:
+            result = requests.get(UPSTREAM["arbiscan"], params=params, timeout=60).json()["result"]
+            self._save(path, json.dumps(result).encode())
+            return result
+        return None
+
+    def indexer(self, path):
+        fixture = self._path("indexer", path.lstrip("/"))
+        content = self._load(fixture)
+        if content is None and self.record:
+            response = requests.get(UPSTREAM["indexer"] + path, timeout=120)
+            if response.status_code == 200:
+                content = response.content
+                self._save(fixture, content)
+        if content is None and self.synthetic:
+            generated = self.synthetic.indexer(path)
+            content = None if generated is None else json.dumps(generated).encode()
+        return content
+
+    def raw(self, path):
+        path = path.lstrip("/")
+        if path in self.deleted:
+            return None
+        content = self._load(self._path("raw", path))
+        if content is None:
+            content = self._load(os.path.join(REPO_ROOT, path))
+        if content is None and self.record:
+            response = requests.get(f"{UPSTREAM['raw']}/{path}", timeout=120)
+            if response.status_code == 200:
+                content = response.content
+                self._save(self._path("raw", path), content)
+        if content is None and self.synthetic:
+            content = self.synthetic.raw(path)
+        return content
+
+    def raw_listing(self, path):
+        path = path.strip("/")
+        names = set()
+        for base in (self._path("raw", path), os.path.join(REPO_ROOT, path)):
+            if os.path.isdir(base):
+                names.update(os.listdir(base))
+        return sorted(name for name in names if f"{path}/{name}" not in self.deleted)
+
+    def write(self, path, content):
+        with self.lock:
+            self.deleted.discard(path)
+            self._save(self._path("raw", path), content)
+
+    def delete(self, path):
+        with self.lock:
+            self.deleted.add(path)
+            if os.path.exists(self._path("raw", path)):
+                os.remove(self._path("raw", path))
+
+    def git_object(self, kind, data):
+        sha = hashlib.sha1(f"{kind}:{time.time_ns()}:{random.random()}".encode()).hexdigest()
+        self.objects[sha] = data
+        return sha
+
+    def git_tree(self, entries):
+        """Checks a tree like GitHub does: deleting a path that isn't there is an error."""
+        for entry in entries:
+            if entry.get("sha", "") is None and self.raw(entry["path"]) is None:
+                return None
+        return self.git_object("tree", entries)
+
+    def git_update_ref(self, commit_sha):
+        """Fast-forwards the branch and applies the commit's tree, False when it isn't a fast-forward."""
+        with self.lock:
+            commit = self.objects.get(commit_sha)
+            if commit is None or commit["parents"] != [self.head]:
+                return False
+            self.head = commit_sha
+        for entry in self.objects[commit["tree"]]:
+            if "content" in entry:
+                self.write(entry["path"], entry["content"].encode())
+            elif entry["sha"] is None:
+                self.delete(entry["path"])
+            else:
+                self.write(entry["path"], self.objects[entry["sha"]])
+        return True
+
+# ----------------------------------------------------------------------
+# HTTP handler
+# ----------------------------------------------------------------------
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    fixtures = None
+    bucket = None
+    latency = 0.0
+    error_rate = 0.0
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body=b"", content_type="application/json", etag=False):
+        if isinstance(body, (dict, list, str)) and content_type == "application/json":
+            body = json.dumps(body).encode()
+        headers = {}
+        if etag and status == 200:
+            # Conditional GETs like raw.githubusercontent and the indexer CDN
+            headers["ETag"] = f'"{hashlib.sha1(body).hexdigest()}"'
+            if self.headers.get("If-None-Match") == headers["ETag"]:
+                status, body = 304, b""
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _prelude(self):
+        """Applies latency and error injection, returns False if the request was answered."""
+        if self.latency:
+            time.sleep(random.uniform(0.5, 1.5) * self.latency)
+        if self.error_rate and random.random() < self.error_rate:
+            self._send(503, b"Service Unavailable", "text/plain")
+            return False
+        return True
+
+    def _limited(self):
+        return self.bucket is not None and not self.bucket.try_acquire()
+
+    def _body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def do_GET(self):
+        if not self._prelude():
+            return
+        url = urlparse(self.path)
+        prefix, _, rest = url.path.lstrip("/").partition("/")
+
+        if prefix == "arbiscan":
+            if self._limited():
+                return self._send(200, RATE_LIMITED)
+            params = {key: values[0] for key, values in parse_qs(url.query).items()}
+            result = self.fixtures.arbiscan(params)
+            if result is None:
+                return self._send(200, {"status": "0", "message": "No fixture", "result": []})
+            if result == []:
+                return self._send(200, {"status": "0", "message": "No transactions found", "result": []})
+            return self._send(200, {"status": "1", "message": "OK", "result": result})
+
+        if self._limited():
+            return self._send(429, b"Too Many Requests", "text/plain")
+        if prefix == "indexer":
+            content = self.fixtures.indexer("/" + rest)
+            return self._send(200, content, etag=True) if content is not None else self._send(404, b"Not Found", "text/plain")
+        if prefix == "raw":
+            content = self.fixtures.raw(rest)
+            return self._send(200, content, "application/octet-stream", etag=True) if content is not None else self._send(404, b"404: Not Found", "text/plain")
+        if prefix == "github" and rest.startswith("git/ref/heads/"):
+            return self._send(200, {"object": {"sha": self.fixtures.head}})
+        if prefix == "github" and rest.startswith("git/commits/"):
+            sha = rest[len("git/commits/"):]
+            return self._send(200, {"sha": sha, "tree": {"sha": sha}})
+        if prefix == "github" and rest.startswith("contents"):
+            path = rest[len("contents"):].strip("/")
+            content = self.fixtures.raw(path)
+            if content is not None:
+                return self._send(200, {"path": path, "sha": hashlib.sha1(content).hexdigest(), "content": base64.b64encode(content).decode()})
+            listing = self.fixtures.raw_listing(path)
+            if listing:
+                return self._send(200, [{"path": f"{path}/{name}", "sha": hashlib.sha1(f"{path}/{name}".encode()).hexdigest()} for name in listing], etag=True)
+            return self._send(404, {"message": "Not Found"})
+        self._send(404, {"message": "Not Found"})
+
+    def do_HEAD(self):
+        prefix, _, rest = urlparse(self.path).path.lstrip("/").partition("/")
+        found = prefix == "raw" and self.fixtures.raw(rest) is not None
+        self.send_response(200 if found else 404)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_POST(self):
+        if not self._prelude():
+            return
+        prefix, _, rest = urlparse(self.path).path.lstrip("/").partition("/")
+        body = self._body()
+        if prefix == "github" and rest == "git/blobs":
+            return self._send(201, {"sha": self.fixtures.git_object("blob", base64.b64decode(body["content"]))})
+        if prefix == "github" and rest == "git/trees":
+            sha = self.fixtures.git_tree(body["tree"])
+            return self._send(201, {"sha": sha}) if sha else self._send(422, {"message": "GitRPC::BadObjectState"})
+        if prefix == "github" and rest == "git/commits":
+            return self._send(201, {"sha": self.fixtures.git_object("commit", {"tree": body["tree"], "parents": body["parents"]})})
+        self._send(404, {"message": "Not Found"})
+
+    def do_PATCH(self):
+        if not self._prelude():
+            return
+        prefix, _, rest = urlparse(self.path).path.lstrip("/").partition("/")
+        if prefix != "github" or not rest.startswith("git/refs/heads/"):
+            return self._send(404, {"message": "Not Found"})
+        if not self.fixtures.git_update_ref(self._body()["sha"]):
+            return self._send(422, {"message": "Update is not a fast forward"})
+        self._send(200, {"object": {"sha": self.fixtures.head}})
+
+    def do_PUT(self):
+        if not self._prelude():
+            return
+        prefix, _, rest = urlparse(self.path).path.lstrip("/").partition("/")
+        if prefix != "github" or not rest.startswith("contents"):
+            return self._send(404, {"message": "Not Found"})
+        path = rest[len("contents"):].strip("/")
+        existed = self.fixtures.raw(path) is not None
+        content = base64.b64decode(self._body()["content"])
+        self.fixtures.write(path, content)
+        self._send(200 if existed else 201, {"content": {"path": path, "sha": hashlib.sha1(content).hexdigest()}})
+
+    def do_DELETE(self):
+        if not self._prelude():
+            return
+        prefix, _, rest = urlparse(self.path).path.lstrip("/").partition("/")
+        path = rest[len("contents"):].strip("/")
+        if prefix != "github" or self.fixtures.raw(path) is None:
+            return self._send(404, {"message": "Not Found"})
+        self.fixtures.delete(path)
+        self._send(200, {"commit": {}})
+
+# ----------------------------------------------------------------------
+# Entry point
+# ----------------------------------------------------------------------
+def serve(port=8765, fixtures_dir="fixtures", latency=0.0, rate=None, error_rate=0.0, record=False, synthetic=None):
+    Handler.fixtures = Fixtures(fixtures_dir, synthetic, record)
+    Handler.bucket = TokenBucket(rate) if rate else None
+    Handler.latency = latency
+    Handler.error_rate = error_rate
+    server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    print(f"export AGDM_ARBISCAN_URL={base}/arbiscan/api")
+    print(f"export AGDM_INDEXER_URL={base}/indexer")
+    print(f"export AGDM_RAW_URL={base}/raw")
+    print(f"export AGDM_GITHUB_API_URL={base}/github")
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline stand-in for Arbiscan, the Gitcoin indexer and GitHub")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fixtures", default="fixtures", help="directory holding recorded responses and writes")
+    parser.add_argument("--latency", type=float, default=0.0, help="mean seconds added to every response")
+    parser.add_argument("--rate", type=float, default=None, help="requests per second before rate limiting kicks in")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with a 503")
+    parser.add_argument("--record", action="store_true", help="fetch and save missing fixtures from the real services")
+    parser.add_argument("--synthetic", action="store_true", help="generate data for anything without a fixture")
+    parser.add_argument("--voters", type=int, default=2000)
+    parser.add_argument("--projects", type=int, default=60)
+    parser.add_argument("--votes", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    synthetic = Synthetic(args.voters, args.projects, args.votes, args.seed) if args.synthetic else None
+    server = serve(args.port, args.fixtures, args.latency, args.rate, args.error_rate, args.record, synthetic)
+    server.serve_forever()
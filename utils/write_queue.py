@@ -0,0 +1,184 @@
+# ----------------------------------------------------------------------
+# Imports
+# ----------------------------------------------------------------------
+import os
+import time
+import sqlite3
+from utils.config import CACHE_DIR
+
+# ----------------------------------------------------------------------
+# Constants
+# ----------------------------------------------------------------------
+QUEUE_PATH = os.path.join(CACHE_DIR, "writes.sqlite")
+RETRY_AFTER = 5  # seconds before a failed flush is retried, doubled on every failure
+MAX_RETRY_AFTER = 10 * 60
+KEEP_FLUSHES = 50  # finished flushes kept for the status line
+
+# ----------------------------------------------------------------------
+# Connection and schema
+# ----------------------------------------------------------------------
+# Every repository write and delete is staged here first (utils/storage.py)
+# and worker.py commits whatever is pending as one atomic commit. Reads in
+# any process see staged content before it reaches the repository.
+def connect():
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    connection = sqlite3.connect(QUEUE_PATH, timeout=30, isolation_level=None)
+    connection.row_factory = sqlite3.Row
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute(
+        """
+        CREATE TABLE IF NOT EXISTS writes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            path TEXT NOT NULL,
+            content BLOB,
+            message TEXT,
+            status TEXT NOT NULL DEFAULT 'pending',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            next_attempt REAL NOT NULL DEFAULT 0,
+            error TEXT,
+            created_at REAL NOT NULL
+        )
+        """
+    )
+    connection.execute("CREATE INDEX IF NOT EXISTS writes_path ON writes (path)")
+    connection.execute(
+        """
+        CREATE TABLE IF NOT EXISTS flushes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            files INTEGER NOT NULL,
+            commit_sha TEXT,
+            finished_at REAL NOT NULL
+        )
+        """
+    )
+    return connection
+
+# ----------------------------------------------------------------------
+# Producer side (storage writes from any process)
+# ----------------------------------------------------------------------
+def stage(path, content, message):
+    """Queues content for path, None queues its deletion. Returns the write id."""
+    connection = connect()
+    try:
+        return connection.execute(
+            "INSERT INTO writes (path, content, message, created_at) VALUES (?, ?, ?, ?)",
+            (path, None if content is None else sqlite3.Binary(content), message, time.time()),
+        ).lastrowid
+    finally:
+        connection.close()
+
+
+def pending(path):
+    """(True, content) for the newest write of path not yet committed, content None for a delete; (False, None) otherwise."""
+    connection = connect()
+    try:
+        row = connection.execute("SELECT content FROM writes WHERE path = ? ORDER BY id DESC LIMIT 1", (path,)).fetchone()
+        return (False, None) if row is None else (True, None if row["content"] is None else bytes(row["content"]))
+    finally:
+        connection.close()
+
+
+def pending_under(directory):
+    """{path: deleted} of the files directly under directory with writes not yet committed."""
+    prefix = directory.rstrip("/") + "/"
+    connection = connect()
+    try:
+        rows = connection.execute(
+            """
+            SELECT path, content IS NULL AS deleted FROM writes
+            WHERE id IN (SELECT MAX(id) FROM writes WHERE substr(path, 1, ?) = ? GROUP BY path)
+            """,
+            (len(prefix), prefix),
+        ).fetchall()
+        return {row["path"]: bool(row["deleted"]) for row in rows if "/" not in row["path"][len(prefix):]}
+    finally:
+        connection.close()
+
+
+def status():
+    """Pending write count, the last commit's time and the error holding the queue back, if any."""
+    connection = connect()
+    try:
+        queued = connection.execute("SELECT COUNT(DISTINCT path) AS files, MAX(error) AS error FROM writes").fetchone()
+        last = connection.execute("SELECT * FROM flushes ORDER BY id DESC LIMIT 1").fetchone()
+        return {
+            "pending": queued["files"],
+            "error": queued["error"],
+            "last_flushed": last["finished_at"] if last else None,
+        }
+    finally:
+        connection.close()
+
+# ----------------------------------------------------------------------
+# Consumer side (worker.py)
+# ----------------------------------------------------------------------
+def claim():
+    """
+        Marks every pending write as flushing and returns them, oldest
+        first, once the oldest is due. Empty while a failed batch waits for
+        its retry, so writes staged meanwhile go out with it and never
+        ahead of it.
+    """
+    connection = connect()
+    try:
+        connection.execute("BEGIN IMMEDIATE")
+        rows = connection.execute("SELECT * FROM writes WHERE status = 'pending' ORDER BY id").fetchall()
+        if rows and rows[0]["next_attempt"] > time.time():
+            rows = []
+        if rows:
+            connection.execute("UPDATE writes SET status = 'flushing' WHERE id <= ? AND status = 'pending'", (rows[-1]["id"],))
+        connection.execute("COMMIT")
+        return [dict(row) for row in rows]
+    finally:
+        connection.close()
+
+
+def coalesce(writes):
+    """{path: content} with the last write of each path, content None for a delete."""
+    changes = {}
+    for write in writes:
+        changes[write["path"]] = None if write["content"] is None else bytes(write["content"])
+    return changes
+
+
+def done(writes, commit_sha=None):
+    connection = connect()
+    try:
+        connection.execute("BEGIN IMMEDIATE")
+        connection.execute("DELETE FROM writes WHERE status = 'flushing' AND id <= ?", (writes[-1]["id"],))
+        connection.execute(
+            "INSERT INTO flushes (files, commit_sha, finished_at) VALUES (?, ?, ?)",
+            (len(coalesce(writes)), commit_sha, time.time()),
+        )
+        connection.execute(
+            "DELETE FROM flushes WHERE id NOT IN (SELECT id FROM flushes ORDER BY id DESC LIMIT ?)", (KEEP_FLUSHES,)
+        )
+        connection.execute("COMMIT")
+    finally:
+        connection.close()
+
+
+def failed(writes, error):
+    """Puts the batch back with exponential backoff; writes staged meanwhile join its retry."""
+    attempts = max(write["attempts"] for write in writes) + 1
+    retry_at = time.time() + min(RETRY_AFTER * 2 ** (attempts - 1), MAX_RETRY_AFTER)
+    connection = connect()
+    try:
+        connection.execute("BEGIN IMMEDIATE")
+        connection.execute(
+            "UPDATE writes SET status = 'pending', attempts = ?, next_attempt = ?, error = ? WHERE status = 'flushing'",
+            (attempts, retry_at, error),
+        )
+        connection.execute("UPDATE writes SET next_attempt = ? WHERE status = 'pending'", (retry_at,))
+        connection.execute("COMMIT")
+    finally:
+        connection.close()
+
+
+def requeue_orphans():
+    """Writes left flushing by a worker that died go back to pending."""
+    connection = connect()
+    try:
+        connection.execute("UPDATE writes SET status = 'pending' WHERE status = 'flushing'")
+    finally:
+        connection.close()
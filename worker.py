@@ -0,0 +1,106 @@
+# ----------------------------------------------------------------------
+# Background enrichment worker
+#
+#   python worker.py
+#
+# Claims refresh jobs queued by the dashboard (utils/job_queue.py) and
+# runs clustering, the recycling scan, block timestamps and voter
+# enrichment outside of page rendering. Between jobs it compacts the
+# main_db delta segments, and it commits the repository writes staged by
+# every process (utils/write_queue.py) as one commit per flush. The
+# dashboard starts one itself when no worker is heartbeating, logging to
+# .cache/worker.log.
+# ----------------------------------------------------------------------
+import time
+import threading
+import traceback
+from datetime import datetime, timedelta
+from utils import http, job_queue, write_queue
+from utils.main_db import compact
+from utils.storage import storage
+from Defense_systems.threat_index import build_threat_index, publish_threat_index
+from utils.data_manager import get_data, get_round_status, create_temp_directory_for_rounds, block_timestamp
+from utils.queryFunctions import get_user_data
+
+# ----------------------------------------------------------------------
+# Constants
+# ----------------------------------------------------------------------
+POLL_INTERVAL = 2
+HEARTBEAT_INTERVAL = 10
+COMPACT_INTERVAL = 10 * 60  # seconds between main_db compaction checks
+
+# ----------------------------------------------------------------------
+# Function to run every stage of a refresh job
+# ----------------------------------------------------------------------
+def run(job):
+    round_id = job["round_id"]
+    progress_bar = job_queue.progress_bar(job["id"])
+
+    job_queue.update(job["id"], stage="Loading round data")
+    voting_data, project_info, round_data = get_data(round_id)
+    round_status, start_time, end_time = get_round_status(round_id)
+
+    # Same cut-off the dashboard used before enrichment moved here. It runs
+    # first so clustering sees this refresh's voter features, and a new
+    # round has its round_user_info parquet before anything reads it
+    if end_time - datetime.now().date() >= timedelta(days=2):
+        block_timestamp(round_id, progress_bar=progress_bar)
+        get_user_data(round_id, progress_bar=progress_bar)
+
+    job_queue.update(job["id"], stage="Clustering and recycling scan")
+    create_temp_directory_for_rounds(round_id, round_status, voting_data, start_time)
+
+    # Everything the job published goes out as a single commit
+    job_queue.update(job["id"], stage="Committing results")
+    storage.flush()
+
+
+def compact_main_db():
+    """Merges waiting main_db deltas and republishes the threat index over the new segments."""
+    try:
+        if compact():
+            publish_threat_index(build_threat_index())
+    except Exception:
+        print(traceback.format_exc())
+
+
+def flush_writes():
+    try:
+        storage.flush()
+    except Exception:
+        print(traceback.format_exc())
+
+
+def beat():
+    while True:
+        job_queue.heartbeat()
+        time.sleep(HEARTBEAT_INTERVAL)
+
+
+def main():
+    threading.Thread(target=beat, daemon=True).start()
+    job_queue.requeue_orphans()
+    write_queue.requeue_orphans()
+    last_compaction = 0
+    while True:
+        # Review submits from the dashboard are committed within a poll
+        flush_writes()
+        job = job_queue.claim()
+        if job is None:
+            if time.time() - last_compaction > COMPACT_INTERVAL:
+                last_compaction = time.time()
+                compact_main_db()
+            time.sleep(POLL_INTERVAL)
+            continue
+        print(f"Refreshing round {job['round_id']} (job {job['id']})")
+        try:
+            run(job)
+            job_queue.finish(job["id"])
+            http.print_stats()
+        except Exception:
+            print(traceback.format_exc())
+            job_queue.finish(job["id"], status="failed", message=traceback.format_exc())
+
+
+if __name__ == "__main__":
+    main()